@@ -0,0 +1,126 @@
+"""
+backfill.py — Historical backfill of past weekly reports
+
+Splits START..END into weekly [start, end) windows and builds each week's report
+in its own process: fetch_news → fetch_research → analyze_trends →
+generate_charts → generate_pdf, with every tool given the explicit window
+instead of "the last 7 days". Artifacts are stamped with the week's last day,
+not today's, and stakeholders are not emailed (and the sheet is not touched)
+for past weeks. The fetchers pace themselves through tools/rate_limit.py,
+whose state file is shared by all worker processes.
+
+Workers do not add their week to the keyword background (doc_freq,
+keyword_series): each returns its documents and, once the pool is done, the
+weeks are indexed one by one in chronological order, so a week's background
+never depends on which workers happened to finish first. The reports
+themselves are ranked against the background as it was before the backfill
+(on an empty index: raw counts, no emerging/fading terms); later runs, or the
+same backfill run again, see the backfilled weeks.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import telemetry
+from dag import StepFailed, run_dag
+
+logger = logging.getLogger("backfill")
+
+BACKFILL_STEPS = ("fetch_news", "fetch_research", "analyze_trends", "generate_charts", "generate_pdf")
+
+
+def parse_range(spec: str) -> tuple:
+    """'2026-01-05..2026-03-30' → (start, end) datetimes, END inclusive."""
+    try:
+        start_str, end_str = spec.split("..")
+        start = datetime.strptime(start_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        end = datetime.strptime(end_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise ValueError(f"Backfill range must look like YYYY-MM-DD..YYYY-MM-DD, got '{spec}'")
+    if end < start:
+        raise ValueError(f"Backfill range ends before it starts: '{spec}'")
+    return start, end
+
+
+def weekly_windows(start: datetime, end: datetime) -> list:
+    """[start, start+7d), [start+7d, start+14d), … covering START..END inclusive."""
+    stop = end + timedelta(days=1)
+    windows = []
+    week_start = start
+    while week_start < stop:
+        week_end = min(week_start + timedelta(days=7), stop)
+        windows.append((week_start, week_end))
+        week_start = week_end
+    return windows
+
+
+def _run_week(build_steps, profile: dict) -> tuple:
+    """
+    Process-pool worker: build one week's report. Returns a JSON-able summary
+    and the week's (articles, papers) for index_weeks().
+    """
+    steps = [s for s in build_steps(profile) if s.name in BACKFILL_STEPS]
+    summary = {"week": profile["datestamp"], "start": profile["start"], "end": profile["end"], "status": "ok"}
+    try:
+        run = run_dag(steps, context={"run_date": profile["end"]}, profile=telemetry.profile_step)
+    except StepFailed as e:
+        run = e.run
+        summary.update(status="failed", failed_step=e.step, error=str(e.error))
+
+    analysis = run.results.get("analyze_trends") or {}
+    summary.update({
+        "articles_processed": analysis.get("article_count", 0),
+        "papers_processed": analysis.get("paper_count", 0),
+        "top_5_keywords": [k["keyword"] for k in analysis.get("top_keywords", [])[:5]],
+        "pdf_path": (run.results.get("generate_pdf") or {}).get("pdf_path", ""),
+        "steps": {name: {"status": run.status.get(name), **run.timings.get(name, {})} for name in BACKFILL_STEPS},
+    })
+    documents = None
+    if "analyze_trends" in run.results:
+        documents = (run.results["fetch_news"]["articles"], run.results["fetch_research"]["papers"])
+    return summary, documents
+
+
+def index_weeks(weeks: list):
+    """Add each backfilled week's keywords to doc_freq / keyword_series, oldest first."""
+    import analyze_trends  # deferred like main._tool, so importing backfill stays light
+
+    for profile, (articles, papers) in sorted(weeks, key=lambda w: w[0]["end"]):
+        analyze_trends.analyze_trends(articles, papers, run_date=profile["end"], index=True)
+
+
+def run_backfill(spec: str, build_steps, defaults: dict, max_workers: int = None) -> list:
+    windows = weekly_windows(*parse_range(spec))
+    logger.info(f"Backfill: {len(windows)} weekly windows from {spec}")
+
+    profiles = [
+        {
+            **defaults,
+            "start": week_start.isoformat(),
+            "end": week_end.isoformat(),
+            "days_back": (week_end - week_start).days,
+            "datestamp": (week_end - timedelta(days=1)).strftime("%Y%m%d"),  # end is exclusive
+            "incremental": False,  # past windows sit behind the high-water mark; fetch them whole
+            "index": False,        # weeks are indexed in order by index_weeks() once all are built
+        }
+        for week_start, week_end in windows
+    ]
+
+    results, built = [], []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_run_week, build_steps, p): p for p in profiles}
+        for future, profile in futures.items():
+            try:
+                summary, documents = future.result()
+            except Exception as e:  # worker crashed
+                summary, documents = {"week": profile["datestamp"], "status": "failed", "error": str(e)}, None
+            if documents is not None:
+                built.append((profile, documents))
+            logger.info(f"Backfill week {summary['week']}: {summary['status']}"
+                        + (f" — {summary['error']}" if summary.get("error") else ""))
+            results.append(summary)
+
+    logger.info(f"Backfill: indexing keywords of {len(built)} weeks in chronological order")
+    index_weeks(built)
+    return results
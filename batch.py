@@ -0,0 +1,167 @@
+"""
+batch.py — Multi-report batch mode
+
+Builds several variants of the weekly report (different queries, recipients and
+keyword limits) from one shared fetch. Each distinct NewsAPI / ArXiv query is
+fetched exactly once per set of fetch options (window, incremental,
+shard_by_day), at the largest size any profile asks for, even when profiles
+list it among different queries. Every profile then gets its own queries'
+results merged back (fetch_news / fetch_research merge_results), cut to its
+size, and runs analyze_trends → generate_charts → generate_pdf → send_email
+in its own process.
+
+Profiles file (JSON) — a list, or {"profiles": [...]}; unset keys fall back to
+main.DEFAULT_PROFILE:
+    [
+      {"name": "exec", "top_keywords": 10, "recipients": ["ceo@example.com"]},
+      {"name": "robotics", "news_query": "robotics automation", "max_articles": 30},
+      {"name": "hardware", "news_query": ["AI chips", "GPU supply", "data center power"]}
+    ]
+"""
+
+import importlib
+import json
+import logging
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+import telemetry
+from dag import StepFailed, run_dag
+
+logger = logging.getLogger("batch")
+
+# Steps each profile runs on its slice of the shared corpus
+PROFILE_STEPS = ("analyze_trends", "generate_charts", "generate_pdf", "send_email")
+
+
+def load_profiles(path: str, defaults: dict) -> list:
+    with open(path) as f:
+        data = json.load(f)
+    raw = data["profiles"] if isinstance(data, dict) else data
+    if not raw:
+        raise ValueError(f"No report profiles in {path}")
+
+    profiles = []
+    for i, entry in enumerate(raw):
+        profile = {**defaults, **entry}
+        # The name doubles as the artifact label, so keep it file-name safe
+        profile["name"] = re.sub(r"[^A-Za-z0-9_-]+", "_", entry.get("name") or f"profile{i + 1}")
+        profiles.append(profile)
+
+    names = [p["name"] for p in profiles]
+    duplicates = {n for n in names if names.count(n) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate profile names: {', '.join(sorted(duplicates))}")
+    return profiles
+
+
+# Per source: the profile's query and size keys, and every other key that shapes the fetch.
+# Profiles that agree on all of those for a query share one fetch of it.
+FETCH_KEYS = {
+    "fetch_news": ("news_query", "max_articles", ("days_back", "start", "end", "incremental", "shard_by_day")),
+    "fetch_research": ("research_query", "max_papers", ("days_back", "start", "end", "incremental")),
+}
+
+
+def _queries(query) -> list:
+    """A query, or a list of queries, as a list of distinct queries."""
+    return [query] if isinstance(query, str) else list(dict.fromkeys(query))
+
+
+def _fetch_name(source: str, profile: dict, query: str) -> str:
+    """Step name of the shared fetch of one query with a profile's fetch options."""
+    options = ",".join(f"{k}={profile[k]}" for k in FETCH_KEYS[source][2] if profile.get(k) not in (None, False))
+    return f"{source}[{options}]:{query}"
+
+
+def _fetch_steps(profiles: list, build_steps) -> list:
+    """One fetch step per distinct query and fetch options, sized for the hungriest profile."""
+    steps = []
+    for source, (query_key, size_key, option_keys) in FETCH_KEYS.items():
+        wanted = {}
+        for p in profiles:
+            for query in _queries(p[query_key]):
+                spec = wanted.setdefault(_fetch_name(source, p, query),
+                                         {**{k: p[k] for k in option_keys}, query_key: query, size_key: 0})
+                spec[size_key] = max(spec[size_key], p[size_key])
+        for name, spec in wanted.items():
+            step = next(s for s in build_steps(spec) if s.name == source)
+            steps.append(replace(step, name=name))
+    return steps
+
+
+def _profile_context(profile: dict, shared: dict, run_date: str) -> dict:
+    """The profile's fetch results, merged back from the shared per-query fetches and cut to its size."""
+    context = {"run_date": run_date}
+    for source, items_key in (("fetch_news", "articles"), ("fetch_research", "papers")):
+        query_key, size_key, _ = FETCH_KEYS[source]
+        fetches = {q: shared[_fetch_name(source, profile, q)] for q in _queries(profile[query_key])}
+        # Deferred like main._tool: only batch runs need the fetchers' merge logic
+        merge = importlib.import_module(source).merge_results
+        items = merge({q: r[items_key] for q, r in fetches.items()})[:profile[size_key]]
+        context[source] = {
+            items_key: items,
+            "count": len(items),
+            "fetched_at": min(r["fetched_at"] for r in fetches.values()),
+        }
+    return context
+
+
+def _run_profile(build_steps, profile: dict, context: dict) -> dict:
+    """Process-pool worker: run one profile's downstream steps and return a JSON-able summary."""
+    steps = [s for s in build_steps(profile) if s.name in PROFILE_STEPS]
+    summary = {"profile": profile["name"], "status": "ok"}
+    try:
+        run = run_dag(steps, context=context, profile=telemetry.profile_step)
+    except StepFailed as e:
+        run = e.run
+        summary.update(status="failed", failed_step=e.step, error=str(e.error))
+
+    analysis = run.results.get("analyze_trends") or {}
+    summary.update({
+        "articles_processed": analysis.get("article_count", 0),
+        "papers_processed": analysis.get("paper_count", 0),
+        "top_5_keywords": [k["keyword"] for k in analysis.get("top_keywords", [])[:5]],
+        "pdf_path": (run.results.get("generate_pdf") or {}).get("pdf_path", ""),
+        "email_status": (
+            "sent" if (run.results.get("send_email") or {}).get("sent")
+            else run.status.get("send_email", "not_sent")
+        ),
+        "steps": {name: {"status": run.status.get(name), **run.timings.get(name, {})} for name in PROFILE_STEPS},
+    })
+    return summary
+
+
+def run_batch(profiles: list, build_steps, run_date: str, max_workers: int = None) -> dict:
+    """
+    Fetch every distinct query once, then fan the shared corpus out to one
+    process per profile. Raises StepFailed if a shared fetch fails, since no
+    profile can run without it.
+    """
+    fetch_steps = _fetch_steps(profiles, build_steps)
+    logger.info(f"Batch: {len(profiles)} profiles share {len(fetch_steps)} upstream fetches")
+    fetch_run = run_dag(fetch_steps, context={"run_date": run_date}, profile=telemetry.profile_step)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_run_profile, build_steps, p, _profile_context(p, fetch_run.results, run_date)): p
+            for p in profiles
+        }
+        for future, profile in futures.items():
+            try:
+                summary = future.result()
+            except Exception as e:  # worker crashed or returned something unpicklable
+                summary = {"profile": profile["name"], "status": "failed", "error": str(e)}
+            logger.info(f"Batch profile '{summary['profile']}': {summary['status']}"
+                        + (f" — {summary['error']}" if summary.get("error") else ""))
+            results.append(summary)
+
+    return {
+        "fetches": {
+            s.name: {"status": fetch_run.status.get(s.name), **fetch_run.timings.get(s.name, {})}
+            for s in fetch_steps
+        },
+        "profiles": results,
+    }
@@ -0,0 +1,128 @@
+"""
+benchmarks/bench_analyze_trends.py
+Compares the single-pass analysis (analyze_trends.analyze_stream) with the
+list-building analysis analyze_trends used before (texts list, then every token
+in one list, then one joined lowercase string for the themes), on synthetic
+corpora of growing size with realistic abstracts.
+
+Peak memory is the tracemalloc high-water mark while analysing. "list" hands
+both variants the same pre-built lists, like main.py does; "generator" feeds
+analyze_stream documents made on the fly (how a corpus cursor feeds it), so it
+shows the analysis' own footprint. All must agree on the document counts and
+summary stats (keywords and themes differ: phrases now join the keywords and
+the word-boundary matcher replaced substring counting).
+
+Usage:
+    python benchmarks/bench_analyze_trends.py [--sizes 5000 20000 50000] [--repeat 3]
+"""
+
+import argparse
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+from analyze_trends import AI_THEME_KEYWORDS, STOP_WORDS, analyze_stream  # noqa: E402
+
+NOW = datetime(2026, 3, 16, tzinfo=timezone.utc)
+ABSTRACT = ("We study scaling behaviour of transformer language models under reinforcement learning "
+            "from human feedback, and propose an alignment objective that improves robustness "
+            "of medical diagnosis agents deployed on GPU inference clusters. ") * 6
+SOURCES = ["TechCrunch", "The Verge", "Wired", "VentureBeat", "MIT Technology Review"]
+
+
+def list_analyze(articles: list, papers: list, top_n: int = 20) -> dict:
+    """The analysis analyze_trends ran before streaming (kept here as the baseline)."""
+    texts = [f"{a.get('title', '')} {a.get('description', '')}" for a in articles]
+    texts += [f"{p.get('title', '')} {p.get('abstract', '')}" for p in papers]
+    all_words = []
+    for text in texts:
+        all_words.extend(w for w in re.findall(r'\b[a-z]{3,}\b', text.lower()) if w not in STOP_WORDS)
+    word_counts = Counter(all_words)
+
+    combined = " ".join(texts).lower()
+    theme_scores = {}
+    for theme, keywords in AI_THEME_KEYWORDS.items():
+        score = sum(combined.count(kw) for kw in keywords)
+        if score > 0:
+            theme_scores[theme] = score
+    trending_themes = [theme for theme, _ in sorted(theme_scores.items(), key=lambda x: -x[1])]
+
+    all_dates = sorted(filter(None, [a.get("published_at") for a in articles] +
+                                    [p.get("published_at") for p in papers]))
+    sources = [a.get("source", "") for a in articles if a.get("source")]
+    return {
+        "top_keywords": [{"keyword": w, "count": c} for w, c in word_counts.most_common(top_n)],
+        "trending_themes": trending_themes[:8],
+        "article_count": len(articles),
+        "paper_count": len(papers),
+        "summary_stats": {
+            "total_sources": len(articles) + len(papers),
+            "date_range": f"{all_dates[0][:10]} to {all_dates[-1][:10]}" if all_dates else "N/A",
+            "most_active_source": Counter(sources).most_common(1)[0][0] if sources else "N/A",
+        },
+    }
+
+
+def _published(i: int, n: int) -> str:
+    return (NOW - timedelta(minutes=i * 7 * 24 * 60 // max(n, 1) + 1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def gen_articles(n: int):
+    for i in range(n):
+        yield {"title": f"Startup {i} ships an open source chatbot", "source": SOURCES[i % len(SOURCES)],
+               "description": ABSTRACT[: 200 + i % 300], "published_at": _published(i, n)}
+
+
+def gen_papers(n: int):
+    for i in range(n):
+        yield {"title": f"Paper {i} on scalable alignment", "abstract": f"{ABSTRACT} token{i % 997}",
+               "published_at": _published(i, n)}
+
+
+def measure(fn, repeat: int) -> tuple:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, statistics.median(times), peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 20000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'docs':>7}  {'variant':<24}{'median s':>9}  {'peak MB':>8}")
+    for n in args.sizes:
+        articles, papers = list(gen_articles(n // 4)), list(gen_papers(n - n // 4))
+        variants = {
+            "list (before)": lambda: list_analyze(articles, papers),
+            "single pass, list": lambda: analyze_stream(articles, papers),
+            "single pass, generator": lambda: analyze_stream(gen_articles(n // 4), gen_papers(n - n // 4)),
+        }
+        expected = None
+        for name, fn in variants.items():
+            result, seconds, peak_mb = measure(fn, args.repeat)
+            result = {k: result[k] for k in ("article_count", "paper_count", "summary_stats")}
+            if expected is None:
+                expected = result
+            elif result != expected:
+                sys.exit(f"{name}: result differs from the baseline")
+            print(f"{n:>7}  {name:<24}{seconds:>9.3f}  {peak_mb:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
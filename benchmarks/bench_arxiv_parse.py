@@ -0,0 +1,124 @@
+"""
+benchmarks/bench_arxiv_parse.py
+Compares the streaming ArXiv parser (fetch_research.iter_papers) with the
+whole-tree parser fetch_research used before (ET.fromstring + findtext per
+field), on synthetic Atom feeds of growing size with realistic abstracts.
+
+Peak memory is the tracemalloc high-water mark while parsing, excluding the
+response bytes themselves (the tree variant includes decoding them to str, as
+fetch_research did via response.text). "streamed" consumes papers one at a
+time without keeping them (how a caller writing straight to the corpus would
+use it), so it shows the parser's own footprint; "list" keeps every paper like
+fetch_research does.
+
+Usage:
+    python benchmarks/bench_arxiv_parse.py [--sizes 1000 5000 10000] [--repeat 3]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+from fetch_research import ARXIV_NS, iter_papers  # noqa: E402
+
+NOW = datetime(2026, 3, 16, tzinfo=timezone.utc)
+WINDOW = (NOW - timedelta(days=7), NOW)
+ABSTRACT = ("We study scaling behaviour of transformer language models under reinforcement learning "
+            "from human feedback, and propose an alignment objective that improves robustness. ") * 12
+
+
+def tree_parse(xml_text: str, cutoff_date: datetime, end_date: datetime) -> list:
+    """The parser fetch_research used before streaming (kept here as the baseline)."""
+    root = ET.fromstring(xml_text)
+    entries = root.findall(f"{{{ARXIV_NS}}}entry")
+
+    papers = []
+    for entry in entries:
+        published_str = entry.findtext(f"{{{ARXIV_NS}}}published", "")
+        try:
+            published_dt = datetime.fromisoformat(published_str.replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        if published_dt < cutoff_date or published_dt >= end_date:
+            continue
+        arxiv_id_raw = entry.findtext(f"{{{ARXIV_NS}}}id", "")
+        arxiv_id = arxiv_id_raw.split("/abs/")[-1] if "/abs/" in arxiv_id_raw else arxiv_id_raw
+        authors = [a.findtext(f"{{{ARXIV_NS}}}name", "") for a in entry.findall(f"{{{ARXIV_NS}}}author")]
+        categories = [
+            tag.get("term", "") for tag in entry.findall("{http://arxiv.org/schemas/atom}primary_category")
+        ] + [
+            tag.get("term", "") for tag in entry.findall(f"{{{ARXIV_NS}}}category")
+        ]
+        papers.append({
+            "title": entry.findtext(f"{{{ARXIV_NS}}}title", "").strip(),
+            "authors": authors[:5],
+            "abstract": entry.findtext(f"{{{ARXIV_NS}}}summary", "").strip(),
+            "arxiv_id": arxiv_id,
+            "published_at": published_str,
+            "categories": list(set(filter(None, categories))),
+        })
+    return papers
+
+
+def make_feed(n: int) -> bytes:
+    entries = []
+    for i in range(n):
+        published = (NOW - timedelta(minutes=i * 7 * 24 * 60 // max(n, 1) + 1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        authors = "".join(f"<author><name>Author {i}-{a}</name></author>" for a in range(8))
+        entries.append(
+            f"<entry><id>http://arxiv.org/abs/2603.{i:05d}v2</id><published>{published}</published>"
+            f"<updated>{published}</updated><title>Paper {i} on scalable alignment</title>"
+            f"<summary>{ABSTRACT}</summary>{authors}"
+            f'<arxiv:primary_category term="cs.LG"/><category term="cs.LG"/><category term="cs.AI"/></entry>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom" '
+        'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+        f"<opensearch:totalResults>{n}</opensearch:totalResults>{''.join(entries)}</feed>"
+    ).encode()
+
+
+VARIANTS = {
+    "tree (before)": lambda body: len(tree_parse(body.decode(), *WINDOW)),
+    "iterparse, list": lambda body: len(list(iter_papers(body, *WINDOW))),
+    "iterparse, streamed": lambda body: sum(1 for _ in iter_papers(body, *WINDOW)),
+}
+
+
+def measure(fn, body: bytes, repeat: int) -> tuple:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = fn(body)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, statistics.median(times), peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'entries':>8}  {'body MB':>8}  {'variant':<22}{'papers':>7}  {'median s':>9}  {'peak MB':>8}")
+    for n in args.sizes:
+        body = make_feed(n)
+        for name, fn in VARIANTS.items():
+            count, seconds, peak_mb = measure(fn, body, args.repeat)
+            print(f"{n:>8}  {len(body) / 2**20:>8.1f}  {name:<22}{count:>7}  {seconds:>9.3f}  {peak_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
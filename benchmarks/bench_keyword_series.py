@@ -0,0 +1,66 @@
+"""
+benchmarks/bench_keyword_series.py
+Fills a throwaway keyword time series store (tools/keyword_series.py) with
+synthetic weeks drawn from a large vocabulary, then times trends() for one more
+week, to check the store copes with years of history and a vocabulary of
+hundreds of thousands of terms.
+
+Terms are drawn log-uniformly from the vocabulary and counted by a Zipf-like
+curve, so each week holds a few thousand common terms plus a long tail.
+
+Usage:
+    python benchmarks/bench_keyword_series.py [--weeks 156] [--vocab 300000] [--terms-per-week 60000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+import keyword_series  # noqa: E402
+
+
+def make_week(rng: random.Random, vocab: int, terms: int) -> dict:
+    ranks = {max(1, int(vocab ** rng.random())) for _ in range(terms)}  # log-uniform over the vocabulary
+    return {f"term{r}": max(1, int(5000 / r)) + rng.randint(0, 3) for r in ranks}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--weeks", type=int, default=156)
+    parser.add_argument("--vocab", type=int, default=300_000)
+    parser.add_argument("--terms-per-week", type=int, default=60_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        keyword_series.DB_PATH = os.path.join(tmp, "keyword_series.sqlite")
+        append_times = []
+        for w in range(args.weeks):
+            counts = make_week(rng, args.vocab, args.terms_per_week)
+            start = time.perf_counter()
+            keyword_series.append(f"{2020 + w // 52}-W{w % 52 + 1:02d}", counts)
+            append_times.append(time.perf_counter() - start)
+
+        size_mb = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)) / 2**20
+        current = make_week(rng, args.vocab, args.terms_per_week)
+        current["brand-new term"] = 500
+        start = time.perf_counter()
+        result = keyword_series.trends("9999-W01", current)
+        trends_s = time.perf_counter() - start
+
+    print(f"weeks stored          {args.weeks}")
+    print(f"terms per week        ~{len(current):,}")
+    print(f"append, median s      {sorted(append_times)[len(append_times) // 2]:.3f}")
+    print(f"store size MB         {size_mb:.1f}")
+    print(f"trends() s            {trends_s:.3f}  ({keyword_series.HISTORY_WEEKS} weeks of history)")
+    print(f"top emerging          {[k['keyword'] for k in result['emerging'][:3]]}")
+
+
+if __name__ == "__main__":
+    main()
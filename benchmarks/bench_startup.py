@@ -0,0 +1,81 @@
+"""
+benchmarks/bench_startup.py
+Measures interpreter startup for `main.py --dry-run` against importing every tool
+eagerly (what main.py did before tools were resolved lazily).
+
+Each variant runs in a fresh interpreter so module caches do not carry over.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TOOLS = ["fetch_news", "fetch_research", "analyze_trends", "generate_charts",
+         "generate_pdf", "update_sheets", "send_email"]
+
+# Dummy values so validate_env() passes; no network call is made on --dry-run
+DUMMY_ENV = {
+    "NEWS_API_KEY": "bench", "GMAIL_USER": "bench@example.com", "GMAIL_APP_PASSWORD": "bench",
+    "EMAIL_RECIPIENTS": "bench@example.com", "GOOGLE_SHEET_ID": "bench",
+    "GOOGLE_SHEETS_CREDENTIALS": "credentials.json",
+}
+
+VARIANTS = {
+    "eager tool imports": [
+        sys.executable, "-c",
+        "import sys; sys.path.insert(0, 'tools'); "
+        + "; ".join(f"import {t}" for t in TOOLS),
+    ],
+    "main.py --dry-run (lazy)": [sys.executable, "main.py", "--dry-run"],
+}
+
+HEAVY_MODULES = ["matplotlib", "reportlab", "googleapiclient"]
+
+
+def _time_once(cmd: list) -> float:
+    env = {**os.environ, **DUMMY_ENV}
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def _heavy_modules_loaded() -> list:
+    """Which heavy libraries does a --dry-run actually import?"""
+    probe = (
+        "import runpy, sys; sys.argv = ['main.py', '--dry-run']; "
+        "runpy.run_path('main.py', run_name='__main__'); "
+        f"print('HEAVY:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env={**os.environ, **DUMMY_ENV},
+                         check=True, capture_output=True, text=True).stdout
+    line = next((ln for ln in out.splitlines() if ln.startswith("HEAVY:")), "HEAVY:")
+    return [m for m in line[len("HEAVY:"):].split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    medians = {}
+    for label, cmd in VARIANTS.items():
+        _time_once(cmd)  # warm the filesystem cache
+        samples = [_time_once(cmd) for _ in range(args.repeat)]
+        medians[label] = statistics.median(samples)
+        print(f"{label:<28} median {medians[label] * 1000:7.1f} ms  (min {min(samples) * 1000:.1f} ms)")
+
+    eager, lazy = medians.values()
+    print(f"{'startup saved':<28} {(eager - lazy) * 1000:7.1f} ms  ({eager / lazy:.1f}x faster)")
+    print(f"heavy modules loaded by --dry-run: {', '.join(_heavy_modules_loaded()) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
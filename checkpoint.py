@@ -0,0 +1,117 @@
+"""
+checkpoint.py — Per-step checkpoints for resuming failed runs
+
+Every finished step's result dict (exactly what the tool returned) is saved to
+temp/runs/<run_id>/<step>.json together with a digest of the inputs it was
+computed from. On resume, a checkpoint is reused only if it parses, carries the
+step's declared outputs, passes the step's own `valid` check (artifact still on
+disk, email actually sent, …) and was computed from the same inputs the run now
+holds — so recomputing any step invalidates everything downstream of it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import event_log
+from dag import topological_order
+
+logger = logging.getLogger("checkpoint")
+
+RUNS_DIR = Path(__file__).parent / "temp" / "runs"
+META_FILE = "run.json"
+
+
+def run_dir(run_id: str) -> Path:
+    return RUNS_DIR / run_id
+
+
+def _write_json(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp, path)  # atomic — a killed run never leaves a half-written checkpoint
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def inputs_digest(step, results: dict) -> str:
+    payload = json.dumps({i: results.get(i) for i in step.inputs}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def save_run_meta(run_id: str, run_date: str):
+    _write_json(run_dir(run_id) / META_FILE, {"run_id": run_id, "run_date": run_date})
+
+
+def load_run_meta(run_id: str) -> dict:
+    meta = _read_json(run_dir(run_id) / META_FILE)
+    if meta is None:
+        raise FileNotFoundError(f"No checkpointed run found at {run_dir(run_id)}")
+    return meta
+
+
+def latest_run_id() -> str:
+    runs = sorted(p.name for p in RUNS_DIR.glob("*") if (p / META_FILE).exists()) if RUNS_DIR.exists() else []
+    if not runs:
+        raise FileNotFoundError(f"No checkpointed runs under {RUNS_DIR}")
+    return runs[-1]
+
+
+def save_checkpoint(run_id: str, step, result: dict, results: dict):
+    path = run_dir(run_id) / f"{step.name}.json"
+    _write_json(path, {
+        "step": step.name,
+        "saved_at": datetime.now(timezone.utc).isoformat(),
+        "inputs_digest": inputs_digest(step, results),
+        "result": result,
+    })
+    event_log.emit("artifact_written", step=step.name, path=str(path), bytes=path.stat().st_size)
+
+
+def load_checkpoints(run_id: str, steps: list, context: dict, from_step: Optional[str] = None) -> dict:
+    """
+    Return {step_name: result} for every step whose checkpoint can be reused,
+    given the seeded `context`. `from_step` and everything downstream of it are
+    always recomputed.
+    """
+    by_name = {s.name: s for s in steps}
+    if from_step is not None and from_step not in by_name:
+        raise ValueError(f"Unknown step '{from_step}'")
+
+    results = dict(context)
+    reused = {}
+    for name in topological_order(steps):
+        step = by_name[name]
+        if name == from_step:
+            continue
+        if any(i in by_name and i not in reused for i in step.inputs):
+            continue  # an upstream step will re-run, so this one must too
+
+        checkpoint = _read_json(run_dir(run_id) / f"{name}.json")
+        if checkpoint is None:
+            continue
+        result = checkpoint.get("result") or {}
+        if any(k not in result for k in step.outputs):
+            logger.warning(f"[{name}] checkpoint is missing outputs — recomputing")
+            continue
+        if checkpoint.get("inputs_digest") != inputs_digest(step, results):
+            logger.info(f"[{name}] checkpoint inputs changed — recomputing")
+            continue
+        if step.valid is not None and not step.valid(result):
+            logger.info(f"[{name}] checkpoint no longer valid — recomputing")
+            continue
+
+        results[name] = reused[name] = result
+    return reused
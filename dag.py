@@ -0,0 +1,213 @@
+"""
+dag.py — Step DAG scheduler for the pipeline
+
+Each tool is registered as a Step: the upstream results it reads (inputs),
+the keys its result dict must contain (outputs) and what to do when it fails
+(the policies from the README error table). run_dag() starts every step whose
+inputs are satisfied on a shared worker pool, so independent steps overlap,
+and reports the critical path — the chain of steps that set the wall-clock time.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Callable, ContextManager, Optional
+
+logger = logging.getLogger("dag")
+
+# Failure policies
+STOP = "stop"          # abort the run (no new steps start; running ones finish)
+CONTINUE = "continue"  # log the error, skip dependents, keep going
+RETRY = "retry"        # re-run up to `retries` times, then behave like CONTINUE
+
+POLICIES = (STOP, CONTINUE, RETRY)
+
+
+@dataclass
+class Step:
+    name: str
+    func: Callable[[dict], dict]      # receives the run context, returns the tool's result dict
+    inputs: tuple = ()                # upstream step names (or seeded context keys) it reads
+    outputs: tuple = ()               # keys the result dict must contain
+    on_failure: str = STOP
+    retries: int = 0
+    describe: Optional[Callable[[dict], str]] = None  # one-line summary logged on success
+    valid: Optional[Callable[[dict], bool]] = None     # may a saved result be reused on resume?
+
+
+@dataclass
+class DagRun:
+    results: dict = field(default_factory=dict)   # name → result dict (seeded context included)
+    status: dict = field(default_factory=dict)    # name → ok | failed | skipped | cached
+    timings: dict = field(default_factory=dict)   # name → {"start", "end", "wall_time", ...profile metrics}
+    errors: dict = field(default_factory=dict)    # name → error message
+    critical_path: list = field(default_factory=list)
+
+
+class StepFailed(Exception):
+    """Raised by run_dag when a step with the STOP policy fails."""
+
+    def __init__(self, step: str, error: Exception, run: DagRun):
+        super().__init__(f"{step} failed: {error}")
+        self.step = step
+        self.error = error
+        self.run = run
+
+
+def topological_order(steps: list) -> list:
+    """Step names ordered so every step comes after its inputs. Raises ValueError on a cycle."""
+    by_name = {s.name: s for s in steps}
+    order, visiting, visited = [], set(), set()
+
+    def visit(name):
+        if name in visited or name not in by_name:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through step '{name}'")
+        visiting.add(name)
+        for dep in by_name[name].inputs:
+            visit(dep)
+        visiting.discard(name)
+        visited.add(name)
+        order.append(name)
+
+    for name in by_name:
+        visit(name)
+    return order
+
+
+def _validate(steps: list, context: dict):
+    names = [s.name for s in steps]
+    duplicates = {n for n in names if names.count(n) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate step names: {', '.join(sorted(duplicates))}")
+
+    by_name = {s.name: s for s in steps}
+    for step in steps:
+        if step.on_failure not in POLICIES:
+            raise ValueError(f"{step.name}: unknown failure policy '{step.on_failure}'")
+        unknown = [i for i in step.inputs if i not in by_name and i not in context]
+        if unknown:
+            raise ValueError(f"{step.name}: unknown inputs {unknown}")
+
+    topological_order(steps)
+
+
+def _critical_path(steps: list, run: DagRun) -> list:
+    """Walk back from the last step to finish, following the latest-finishing input each time."""
+    by_name = {s.name: s for s in steps}
+    timed = {name: t for name, t in run.timings.items() if "end" in t}
+    if not timed:
+        return []
+
+    path = []
+    current = max(timed, key=lambda n: timed[n]["end"])
+    while current:
+        path.append({"step": current, "wall_time": timed[current]["wall_time"]})
+        upstream = [i for i in by_name[current].inputs if i in timed]
+        current = max(upstream, key=lambda n: timed[n]["end"]) if upstream else None
+    return path[::-1]
+
+
+def run_dag(steps: list, context: Optional[dict] = None, max_workers: int = 4,
+            on_step_done: Optional[Callable[[Step, dict, dict], None]] = None,
+            profile: Optional[Callable[[str], ContextManager[dict]]] = None) -> DagRun:
+    """
+    Run `steps` as a dependency graph. `context` seeds the run with values steps
+    may read (e.g. run_date) and with results of steps that should not run again —
+    a step whose name is already in the context is marked "cached" and skipped.
+    `on_step_done(step, result, results)` is called after each successful step.
+    `profile(step_name)` is an optional context manager wrapped around each step
+    (retries included) whose yielded metrics dict is merged into the step's timings.
+    Raises StepFailed (carrying the partial DagRun) if a STOP step fails.
+    """
+    context = dict(context or {})
+    _validate(steps, context)
+
+    run = DagRun(results=context)
+    for step in steps:
+        if step.name in context:
+            run.status[step.name] = "cached"
+
+    pending = {s.name: s for s in steps if s.name not in context}
+    running = {}
+    failure = None
+    t0 = time.perf_counter()
+
+    def execute(step: Step) -> dict:
+        timing = run.timings.setdefault(step.name, {})
+        timing["start"] = round(time.perf_counter() - t0, 3)
+        attempts = 1 + (step.retries if step.on_failure == RETRY else 0)
+        metrics = {}
+        try:
+            with profile(step.name) if profile else nullcontext({}) as metrics:
+                for attempt in range(1, attempts + 1):
+                    try:
+                        result = step.func(run.results)
+                        missing = [k for k in step.outputs if k not in result]
+                        if missing:
+                            raise ValueError(f"result is missing outputs {missing}")
+                        return result
+                    except Exception as e:
+                        if attempt == attempts:
+                            raise
+                        logger.warning(f"[{step.name}] attempt {attempt}/{attempts} failed: {e} — retrying")
+        finally:
+            timing["end"] = round(time.perf_counter() - t0, 3)
+            timing["wall_time"] = round(timing["end"] - timing["start"], 3)
+            timing.update({k: v for k, v in metrics.items() if k != "wall_time"})
+
+    def schedule(pool):
+        # Repeat until nothing changes so skips propagate down whole chains
+        changed = True
+        while changed:
+            changed = False
+            for name, step in list(pending.items()):
+                blocked = [i for i in step.inputs if run.status.get(i) in ("failed", "skipped")]
+                if blocked:
+                    del pending[name]
+                    run.status[name] = "skipped"
+                    logger.warning(f"[{name}] skipped — upstream {', '.join(blocked)} did not succeed")
+                    changed = True
+                elif all(i in run.results for i in step.inputs):
+                    del pending[name]
+                    logger.info(f"[{name}] started")
+                    running[pool.submit(execute, step)] = step
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="step") as pool:
+        schedule(pool)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    run.status[step.name] = "failed"
+                    run.errors[step.name] = str(e)
+                    if step.on_failure == STOP:
+                        logger.error(f"[{step.name}] failed: {e}", exc_info=e)
+                        failure = failure or (step.name, e)
+                    else:
+                        logger.error(f"[{step.name}] failed (non-blocking): {e}")
+                    continue
+
+                run.results[step.name] = result
+                run.status[step.name] = "ok"
+                summary = f" → {step.describe(result)}" if step.describe else ""
+                logger.info(f"[{step.name}] done in {run.timings[step.name]['wall_time']}s{summary}")
+                if on_step_done is not None:
+                    on_step_done(step, result, run.results)
+
+            if failure is None:
+                schedule(pool)
+
+    for name in pending:
+        run.status[name] = "skipped"
+
+    run.critical_path = _critical_path(steps, run)
+    if failure is not None:
+        raise StepFailed(failure[0], failure[1], run)
+    return run
@@ -3,15 +3,22 @@ main.py — AI Research Intelligence System
 WAT Framework: Workflows + Agent + Tools
 
 Orchestrates the weekly AI research report pipeline.
-Runs all tools sequentially, passes structured JSON between steps,
-handles errors, and logs the run summary.
+Registers each tool as a step in a dependency graph (see dag.py), runs every
+ready step in parallel, passes structured JSON between steps, applies the
+per-step failure policy, and logs the run summary and critical path.
 
 Usage:
-    python main.py               # Run the full pipeline
-    python main.py --dry-run     # Validate config only, skip API calls
+    python main.py                                   # Run the full pipeline
+    python main.py --dry-run                         # Validate config only, skip API calls
+    python main.py --resume RUN_ID                   # Re-run a failed run, reusing valid checkpoints
+    python main.py --resume RUN_ID --from-step analyze_trends
+                                                     # Recompute analyze_trends and everything downstream
+    python main.py --batch profiles.json             # Build several report variants from one shared fetch
+    python main.py --backfill 2026-01-05..2026-03-29 # Rebuild past weekly reports in parallel
 """
 
 import argparse
+import importlib
 import json
 import logging
 import os
@@ -38,22 +45,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger("main")
 
+# Structured counterpart of the text log, streamed as the run progresses
+EVENTS_PATH = log_filename.with_suffix(".jsonl")
+
 # ── Tool imports ───────────────────────────────────────────────────────────────
 sys.path.insert(0, str(Path(__file__).parent / "tools"))
 
-from fetch_news import fetch_news
-from fetch_research import fetch_research
-from analyze_trends import analyze_trends
-from generate_charts import generate_charts
-from generate_pdf import generate_pdf
-from update_sheets import update_sheets
-from send_email import send_email
+import backfill
+import batch
+import checkpoint
+import event_log
+import telemetry
+from dag import CONTINUE, STOP, Step, StepFailed, run_dag
+
+
+def _tool(name: str):
+    """
+    Resolve a tool's entry point (tools/<name>.py → <name>()) when its step runs.
+    Tools are imported lazily so --dry-run, --resume and partial runs never load
+    matplotlib, reportlab or the Google client unless a step actually needs them.
+    """
+    return getattr(importlib.import_module(name), name)
+
+
+def _send_report(**kwargs) -> dict:
+    """send_email, raising when delivery failed so the run records the step as failed."""
+    result = _tool("send_email")(**kwargs)
+    if not result.get("sent"):
+        raise RuntimeError(f"send_email: delivery failed: {result.get('error', 'unknown error')}")
+    return result
+
+
+def _failed_queries(result: dict) -> str:
+    failed = result.get("failed_queries")
+    return f" (failed queries: {', '.join(failed)})" if failed else ""
 
 
 def send_failure_email(run_date: str, step: str, error: str):
     """Attempt to notify stakeholders of a pipeline failure."""
     try:
-        send_email(
+        _tool("send_email")(
             pdf_path="",
             run_date=run_date,
             article_count=0,
@@ -67,11 +98,19 @@ def send_failure_email(run_date: str, step: str, error: str):
         logger.error(f"Could not send failure email: {e}")
 
 
-def write_run_log(log_data: dict):
+def start_event_stream(run_id: str, mode: str, **fields):
+    event_log.open_log(EVENTS_PATH)
+    event_log.emit("run_started", run_id=run_id, mode=mode, **fields)
+    logger.info(f"Streaming run events to {EVENTS_PATH}")
+
+
+def write_run_log(log_data: dict, status: str = "ok"):
     log_path = LOG_DIR / f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     with open(log_path, "w") as f:
         json.dump(log_data, f, indent=2)
     logger.info(f"Run log saved: {log_path}")
+    event_log.emit("run_finished", status=status, run_log=str(log_path))
+    event_log.close_log()
 
 
 def validate_env():
@@ -82,14 +121,195 @@ def validate_env():
         raise EnvironmentError(f"Missing required environment variables: {', '.join(missing)}")
 
 
-def run_pipeline(dry_run: bool = False):
-    run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+# The weekly report; batch profiles (see batch.py) override any of these keys
+DEFAULT_PROFILE = {
+    "name": "",
+    "days_back": 7,
+    "news_query": "artificial intelligence machine learning",  # or a list of topic queries, fetched concurrently
+    "max_articles": 50,
+    "shard_by_day": False,  # page each day of the news window in parallel (for > 100 articles)
+    "research_query": ["cs.AI", "cs.LG", "cs.CL", "cs.CV", "stat.ML"],  # ArXiv categories and/or text queries
+    "max_papers": 30,
+    "partial_fetch": False,  # True: a failed news/research query is skipped instead of failing the fetch
+    "top_keywords": 20,
+    "recipients": None,  # None → EMAIL_RECIPIENTS from the environment
+    "start": None,       # explicit [start, end) fetch window (ISO8601); None → last days_back days
+    "end": None,
+    "datestamp": None,   # YYYYMMDD stamped on artifacts; None → today
+    "incremental": False,  # True: fetch only the delta since the last run; the window comes from temp/corpus/
+    "index": True,        # add the week to the keyword background (doc_freq, keyword_series); never for named profiles
+}
+
+
+def build_steps(profile: dict = None) -> list:
+    """Register every tool with its inputs, outputs and failure policy (README error table)."""
+    p = {**DEFAULT_PROFILE, **(profile or {})}
+    return [
+        Step(
+            "fetch_news",
+            lambda ctx: _tool("fetch_news")(
+                days_back=p["days_back"],
+                query=p["news_query"],
+                max_articles=p["max_articles"],
+                start=p["start"],
+                end=p["end"],
+                incremental=p["incremental"],
+                shard_by_day=p["shard_by_day"],
+                partial_ok=p["partial_fetch"],
+            ),
+            outputs=("articles", "count"),
+            on_failure=STOP,
+            describe=lambda r: f"{r['count']} articles fetched" + _failed_queries(r),
+        ),
+        Step(
+            "fetch_research",
+            lambda ctx: _tool("fetch_research")(
+                days_back=p["days_back"],
+                query=p["research_query"],
+                max_papers=p["max_papers"],
+                start=p["start"],
+                end=p["end"],
+                incremental=p["incremental"],
+                partial_ok=p["partial_fetch"],
+            ),
+            outputs=("papers", "count"),
+            on_failure=STOP,
+            describe=lambda r: f"{r['count']} papers fetched" + _failed_queries(r),
+        ),
+        Step(
+            "analyze_trends",
+            lambda ctx: _tool("analyze_trends")(
+                articles=ctx["fetch_news"]["articles"],
+                papers=ctx["fetch_research"]["papers"],
+                run_date=ctx["run_date"],
+                top_n=p["top_keywords"],
+                index=p["index"] and not p["name"],  # only the main report's weeks feed the keyword background
+            ),
+            inputs=("fetch_news", "fetch_research", "run_date"),
+            outputs=("top_keywords", "trending_themes", "article_count", "paper_count"),
+            on_failure=STOP,
+            describe=lambda r: f"top theme: {r['trending_themes'][0] if r['trending_themes'] else 'N/A'}",
+        ),
+        Step(
+            "generate_charts",
+            lambda ctx: _tool("generate_charts")(
+                ctx["analyze_trends"], label=p["name"], datestamp=p["datestamp"],
+            ),
+            inputs=("analyze_trends",),
+            outputs=("charts",),
+            on_failure=STOP,
+            describe=lambda r: f"charts: {list(r['charts'].keys())}",
+            valid=lambda r: all(os.path.exists(p) for p in r["charts"].values()),
+        ),
+        Step(
+            "generate_pdf",
+            lambda ctx: _tool("generate_pdf")(
+                articles=ctx["fetch_news"]["articles"],
+                papers=ctx["fetch_research"]["papers"],
+                analysis=ctx["analyze_trends"],
+                charts=ctx["generate_charts"]["charts"],
+                label=p["name"],
+                datestamp=p["datestamp"],
+            ),
+            inputs=("fetch_news", "fetch_research", "analyze_trends", "generate_charts"),
+            outputs=("pdf_path", "page_count"),
+            on_failure=STOP,
+            describe=lambda r: f"{r['pdf_path']} ({r['page_count']} pages)",
+            valid=lambda r: os.path.exists(r["pdf_path"]),
+        ),
+        # update_sheets and send_email both need only the PDF, so they run side by side.
+        # The email links the tracking sheet directly instead of waiting on update_sheets.
+        Step(
+            "update_sheets",
+            lambda ctx: _tool("update_sheets")(
+                run_date=ctx["run_date"],
+                article_count=ctx["analyze_trends"]["article_count"],
+                paper_count=ctx["analyze_trends"]["paper_count"],
+                top_keywords=ctx["analyze_trends"]["top_keywords"],
+                pdf_path=ctx["generate_pdf"]["pdf_path"],
+                status="success",
+            ),
+            inputs=("run_date", "analyze_trends", "generate_pdf"),
+            outputs=("updated",),
+            on_failure=CONTINUE,
+            describe=lambda r: "updated" if r.get("updated") else "FAILED (non-blocking)",
+            valid=lambda r: bool(r.get("updated")),
+        ),
+        Step(
+            "send_email",
+            lambda ctx: _send_report(
+                pdf_path=ctx["generate_pdf"]["pdf_path"],
+                run_date=ctx["run_date"],
+                article_count=ctx["analyze_trends"]["article_count"],
+                paper_count=ctx["analyze_trends"]["paper_count"],
+                top_keywords=ctx["analyze_trends"]["top_keywords"],
+                sheet_url=importlib.import_module("update_sheets").SHEET_URL,
+                recipients=p["recipients"],
+            ),
+            inputs=("run_date", "analyze_trends", "generate_pdf"),
+            outputs=("sent",),
+            on_failure=CONTINUE,  # send_email already retries once itself
+            describe=lambda r: "sent" if r.get("sent") else "FAILED",
+            valid=lambda r: bool(r.get("sent")),
+        ),
+    ]
+
+
+def _fill_log_data(log_data: dict, steps: list, run):
+    results = run.results
+    analysis = results.get("analyze_trends")
+    if analysis:
+        log_data["articles_processed"] = analysis["article_count"]
+        log_data["papers_processed"] = analysis["paper_count"]
+        log_data["top_5_keywords"] = [k["keyword"] for k in analysis["top_keywords"][:5]]
+    if "generate_pdf" in results:
+        log_data["pdf_path"] = results["generate_pdf"]["pdf_path"]
+    if "update_sheets" in results:
+        log_data["sheets_status"] = "updated" if results["update_sheets"].get("updated") else "failed"
+    elif run.status.get("update_sheets") == "failed":
+        log_data["sheets_status"] = "failed"
+    if "send_email" in results:
+        log_data["email_status"] = "sent" if results["send_email"].get("sent") else "failed"
+    elif run.status.get("send_email") == "failed":
+        log_data["email_status"] = "failed"
+
+    log_data["steps"] = {
+        step.name: {
+            "status": run.status.get(step.name, "not_run"),
+            **run.timings.get(step.name, {}),
+            **({"error": run.errors[step.name]} if step.name in run.errors else {}),
+            **({"failed_queries": results[step.name]["failed_queries"]}
+               if (results.get(step.name) or {}).get("failed_queries") else {}),
+        }
+        for step in steps
+    }
+    log_data["critical_path"] = run.critical_path
+    log_data["http_cache"] = {
+        kind: sum(run.timings.get(step.name, {}).get(f"cache_{kind}", 0) for step in steps)
+        for kind in ("hits", "revalidated", "misses")
+    }
+    log_data["rate_limit_wait_s"] = round(
+        sum(run.timings.get(step.name, {}).get("rate_limit_wait_s", 0) for step in steps), 3
+    )
+
+
+def run_pipeline(dry_run: bool = False, resume: str = None, from_step: str = None):
     start_time = datetime.now(timezone.utc)
-    run_date = start_time.isoformat()
+    if from_step and not resume:
+        resume = checkpoint.latest_run_id()
+    if resume:
+        # Keep the original run's identity so the report dates and checkpoints line up
+        run_id = resume
+        run_date = checkpoint.load_run_meta(run_id)["run_date"]
+    else:
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        run_date = start_time.isoformat()
 
     logger.info(f"{'='*60}")
     logger.info(f"AI Research Intelligence Pipeline — Run ID: {run_id}")
     logger.info(f"Start time: {start_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    if resume:
+        logger.info(f"Resuming run {run_id}" + (f" from step {from_step}" if from_step else ""))
     logger.info(f"{'='*60}")
 
     validate_env()
@@ -98,9 +318,12 @@ def run_pipeline(dry_run: bool = False):
         logger.info("Dry run complete — environment variables OK.")
         return
 
+    start_event_stream(run_id, "weekly", resumed=bool(resume), from_step=from_step)
+
     log_data = {
         "run_id": run_id,
-        "start_time": run_date,
+        "start_time": start_time.isoformat(),
+        "resumed": bool(resume),
         "end_time": None,
         "articles_processed": 0,
         "papers_processed": 0,
@@ -108,89 +331,42 @@ def run_pipeline(dry_run: bool = False):
         "pdf_path": "",
         "email_status": "not_sent",
         "sheets_status": "not_updated",
+        "steps": {},
+        "critical_path": [],
     }
 
-    try:
-        # ── Step 1: Fetch News ─────────────────────────────────────
-        logger.info("[Step 1/8] Fetching AI news...")
-        news_result = fetch_news(days_back=7, query="artificial intelligence machine learning", max_articles=50)
-        articles = news_result["articles"]
-        logger.info(f"  → {news_result['count']} articles fetched")
-
-        # ── Step 2: Fetch Research Papers ─────────────────────────
-        logger.info("[Step 2/8] Fetching ArXiv research papers...")
-        research_result = fetch_research(
-            days_back=7,
-            query="artificial intelligence large language models deep learning",
-            max_papers=30,
-        )
-        papers = research_result["papers"]
-        logger.info(f"  → {research_result['count']} papers fetched")
+    steps = build_steps()
+    context = {"run_date": run_date}
+    if resume:
+        reused = checkpoint.load_checkpoints(run_id, steps, context, from_step=from_step)
+        logger.info(f"Reusing checkpoints: {', '.join(reused) or 'none'}")
+        context.update(reused)
+    else:
+        checkpoint.save_run_meta(run_id, run_date)
 
-        # ── Step 3: Analyze Trends ─────────────────────────────────
-        logger.info("[Step 3/8] Analyzing trends and keywords...")
-        analysis = analyze_trends(articles=articles, papers=papers, run_date=run_date)
-        log_data["articles_processed"] = analysis["article_count"]
-        log_data["papers_processed"] = analysis["paper_count"]
-        log_data["top_5_keywords"] = [k["keyword"] for k in analysis["top_keywords"][:5]]
-        logger.info(f"  → Top theme: {analysis['trending_themes'][0] if analysis['trending_themes'] else 'N/A'}")
-        logger.info(f"  → Top keywords: {', '.join(log_data['top_5_keywords'])}")
-
-        # ── Step 4: Generate Charts ────────────────────────────────
-        logger.info("[Step 4/8] Generating charts...")
-        charts_result = generate_charts(analysis)
-        charts = charts_result["charts"]
-        logger.info(f"  → Charts: {list(charts.keys())}")
-
-        # ── Step 5: Generate PDF ───────────────────────────────────
-        logger.info("[Step 5/8] Generating PDF report...")
-        pdf_result = generate_pdf(articles=articles, papers=papers, analysis=analysis, charts=charts)
-        pdf_path = pdf_result["pdf_path"]
-        log_data["pdf_path"] = pdf_path
-        logger.info(f"  → PDF: {pdf_path} ({pdf_result['page_count']} pages)")
-
-        # ── Step 6: Update Google Sheets ──────────────────────────
-        logger.info("[Step 6/8] Updating Google Sheets...")
-        sheets_result = update_sheets(
-            run_date=run_date,
-            article_count=analysis["article_count"],
-            paper_count=analysis["paper_count"],
-            top_keywords=analysis["top_keywords"],
-            pdf_path=pdf_path,
-            status="success",
-        )
-        sheet_url = sheets_result.get("sheet_url", "")
-        log_data["sheets_status"] = "updated" if sheets_result.get("updated") else "failed"
-        logger.info(f"  → Sheets: {'updated' if sheets_result.get('updated') else 'FAILED (non-blocking)'}")
-
-        # ── Step 7: Send Email ─────────────────────────────────────
-        logger.info("[Step 7/8] Sending email report...")
-        email_result = send_email(
-            pdf_path=pdf_path,
-            run_date=run_date,
-            article_count=analysis["article_count"],
-            paper_count=analysis["paper_count"],
-            top_keywords=analysis["top_keywords"],
-            sheet_url=sheet_url,
-        )
-        log_data["email_status"] = "sent" if email_result.get("sent") else "failed"
-        logger.info(f"  → Email: {'sent' if email_result.get('sent') else 'FAILED'}")
+    def save(step, result, results):
+        checkpoint.save_checkpoint(run_id, step, result, results)
 
-    except Exception as e:
-        logger.error(f"Pipeline failed: {e}", exc_info=True)
-        send_failure_email(run_date=run_date, step="pipeline", error=str(e))
+    try:
+        run = run_dag(steps, context=context, on_step_done=save, profile=telemetry.profile_step)
+    except StepFailed as e:
+        logger.error(f"Pipeline failed at {e.step}: {e.error}")
+        _fill_log_data(log_data, steps, e.run)
+        send_failure_email(run_date=run_date, step=e.step, error=str(e.error))
         log_data["email_status"] = "failure_notification_sent"
         log_data["end_time"] = datetime.now(timezone.utc).isoformat()
-        write_run_log(log_data)
+        write_run_log(log_data, status="failed")
         sys.exit(1)
 
-    # ── Step 8: Log Summary ────────────────────────────────────────
-    logger.info("[Step 8/8] Writing run summary log...")
+    # ── Log Summary ────────────────────────────────────────────────
+    logger.info("Writing run summary log...")
+    _fill_log_data(log_data, steps, run)
     end_time = datetime.now(timezone.utc)
     log_data["end_time"] = end_time.isoformat()
     write_run_log(log_data)
 
     duration = (end_time - start_time).seconds
+    critical_path = " → ".join(f"{p['step']} ({p['wall_time']}s)" for p in run.critical_path)
     logger.info(f"{'='*60}")
     logger.info(f"Pipeline complete in {duration}s")
     logger.info(f"  Articles: {log_data['articles_processed']}")
@@ -199,11 +375,86 @@ def run_pipeline(dry_run: bool = False):
     logger.info(f"  PDF:      {log_data['pdf_path']}")
     logger.info(f"  Email:    {log_data['email_status']}")
     logger.info(f"  Sheets:   {log_data['sheets_status']}")
+    logger.info(f"  Critical path: {critical_path or 'N/A'}")
+    logger.info(f"{'='*60}")
+
+
+def run_batch_pipeline(profiles_path: str):
+    start_time = datetime.now(timezone.utc)
+    run_id = start_time.strftime("%Y%m%d_%H%M%S")
+    run_date = start_time.isoformat()
+
     logger.info(f"{'='*60}")
+    logger.info(f"AI Research Intelligence Pipeline — Batch Run ID: {run_id}")
+    logger.info(f"{'='*60}")
+
+    validate_env()
+    profiles = batch.load_profiles(profiles_path, DEFAULT_PROFILE)
+    log_data = {"run_id": run_id, "mode": "batch", "start_time": run_date, "end_time": None}
+    start_event_stream(run_id, "batch", profiles=[p["name"] for p in profiles])
+
+    try:
+        log_data.update(batch.run_batch(profiles, build_steps, run_date))
+    except StepFailed as e:
+        logger.error(f"Batch failed at shared fetch {e.step}: {e.error}")
+        send_failure_email(run_date=run_date, step=e.step, error=str(e.error))
+        log_data["failed_step"] = e.step
+        log_data["end_time"] = datetime.now(timezone.utc).isoformat()
+        write_run_log(log_data, status="failed")
+        sys.exit(1)
+
+    failed = [p["profile"] for p in log_data["profiles"] if p["status"] != "ok"]
+    log_data["end_time"] = datetime.now(timezone.utc).isoformat()
+    write_run_log(log_data, status="failed" if failed else "ok")
+
+    logger.info(f"Batch complete: {len(profiles) - len(failed)}/{len(profiles)} profiles succeeded")
+    if failed:
+        logger.error(f"Failed profiles: {', '.join(failed)}")
+        sys.exit(1)
+
+
+def run_backfill_pipeline(spec: str):
+    start_time = datetime.now(timezone.utc)
+    run_id = start_time.strftime("%Y%m%d_%H%M%S")
+
+    logger.info(f"{'='*60}")
+    logger.info(f"AI Research Intelligence Pipeline — Backfill Run ID: {run_id} ({spec})")
+    logger.info(f"{'='*60}")
+
+    validate_env()
+    start_event_stream(run_id, "backfill", range=spec)
+    weeks = backfill.run_backfill(spec, build_steps, DEFAULT_PROFILE)
+    failed = [w["week"] for w in weeks if w["status"] != "ok"]
+    write_run_log({
+        "run_id": run_id,
+        "mode": "backfill",
+        "range": spec,
+        "start_time": start_time.isoformat(),
+        "end_time": datetime.now(timezone.utc).isoformat(),
+        "weeks": weeks,
+    }, status="failed" if failed else "ok")
+
+    logger.info(f"Backfill complete: {len(weeks) - len(failed)}/{len(weeks)} weeks built")
+    if failed:
+        logger.error(f"Failed weeks: {', '.join(failed)}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="AI Research Intelligence Pipeline")
     parser.add_argument("--dry-run", action="store_true", help="Validate config only, skip API calls")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Resume a previous run, skipping steps with a valid checkpoint in temp/runs/RUN_ID")
+    parser.add_argument("--from-step", choices=[s.name for s in build_steps()],
+                        help="Recompute this step and everything downstream (defaults to the latest run)")
+    parser.add_argument("--batch", metavar="PROFILES_JSON",
+                        help="Build one report per profile in this file from a single shared fetch")
+    parser.add_argument("--backfill", metavar="START..END",
+                        help="Rebuild the weekly reports for START..END (YYYY-MM-DD, inclusive) in parallel")
     args = parser.parse_args()
-    run_pipeline(dry_run=args.dry_run)
+    if args.backfill:
+        run_backfill_pipeline(args.backfill)
+    elif args.batch:
+        run_batch_pipeline(args.batch)
+    else:
+        run_pipeline(dry_run=args.dry_run, resume=args.resume, from_step=args.from_step)
@@ -1,16 +1,44 @@
 """
 Tool: analyze_trends.py
 Responsibility: Analyze keyword frequency and trending themes from merged news + research data.
-Input:  {"articles": [...], "papers": [...], "run_date": str}
+                Without articles/papers, reads the [start, end) window from the local
+                corpus (see corpus.py) instead — no network access.
+                Documents are counted in a single pass (TrendCounter), so
+                analyze_stream() also accepts generators and peak memory is
+                bounded by the counters plus the largest single document.
+                Themes are matched on word boundaries by one Aho-Corasick scan
+                per document (see theme_matcher.py).
+                Bigrams and trigrams that never cross a stop word or punctuation
+                are counted too; those that are frequent and significant by
+                Dunning's log-likelihood ratio join the unigrams in top_keywords
+                and are listed by score in top_phrases.
+                Keywords are ranked by TF-IDF against the document frequencies of
+                all past runs (see doc_freq.py), so evergreen words like
+                "learning" no longer crowd out what is specific to this week;
+                with index=True the week is added to that background.
+                Each indexed week's keyword counts also go to a time series
+                store (see keyword_series.py); terms whose share of this week
+                jumps or drops against the previous weeks are listed as
+                "emerging" and "fading".
+Input:  {"articles": [...], "papers": [...], "run_date": str, "top_n": int (optional, default 20),
+         "start": ISO8601 (optional), "end": ISO8601 (optional), "index": bool (optional)}
 Output: {"top_keywords": [...], "trending_themes": [...], "article_count": int,
-         "paper_count": int, "summary_stats": {...}}
+         "top_phrases": [{"phrase", "count", "score"}], "paper_count": int, "theme_document_counts": {theme: int},
+         "emerging": [{"keyword", "count", "delta", "growth", "z"}], "fading": [...], "summary_stats": {...}}
 """
 
+import heapq
 import json
+import math
 import re
 import logging
 from collections import Counter
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+
+import corpus
+import doc_freq
+import keyword_series
+from theme_matcher import ThemeMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -42,31 +70,83 @@ AI_THEME_KEYWORDS = {
 }
 
 
+WORD_RE = re.compile(r"\b[a-z]{3,}\b")
+THEME_MATCHER = ThemeMatcher(AI_THEME_KEYWORDS)
+
+# Phrase tokens: words, or any other non-space character, which ends the current phrase.
+# Hyphens join words like spaces do, so "open-source" counts as "open source".
+PHRASE_TOKEN_RE = re.compile(r"[a-z0-9]+|[^a-z0-9\s-]")
+# Stop words for keywords that still belong inside phrases ("language model", "training data")
+PHRASE_WORDS = {"model", "models", "data", "research"}
+PHRASE_MIN_SUPPORT = 3     # occurrences a phrase needs before it is scored
+PHRASE_MIN_LLR = 10.83     # log-likelihood ratio for p < 0.001 (chi-squared, 1 d.o.f.)
+PHRASE_CAP = 200_000       # distinct phrases held before rare ones are pruned
+
+
 def extract_text(articles: list, papers: list) -> list[str]:
-    texts = []
+    return list(iter_texts(articles, papers))
+
+
+def iter_texts(articles, papers):
+    """One "title body" string per article/paper, lazily."""
     for article in articles:
-        texts.append(f"{article.get('title', '')} {article.get('description', '')}")
+        yield f"{article.get('title', '')} {article.get('description', '')}"
     for paper in papers:
-        texts.append(f"{paper.get('title', '')} {paper.get('abstract', '')}")
-    return texts
+        yield f"{paper.get('title', '')} {paper.get('abstract', '')}"
 
 
 def tokenize(text: str) -> list[str]:
-    text = text.lower()
-    words = re.findall(r'\b[a-z]{3,}\b', text)
-    return [w for w in words if w not in STOP_WORDS]
-
-
-def detect_themes(texts: list[str]) -> list[str]:
-    combined = " ".join(texts).lower()
-    theme_scores = {}
-    for theme, keywords in AI_THEME_KEYWORDS.items():
-        score = sum(combined.count(kw) for kw in keywords)
-        if score > 0:
-            theme_scores[theme] = score
+    return [w for w in WORD_RE.findall(text.lower()) if w not in STOP_WORDS]
+
+
+def theme_counts(text: str) -> Counter:
+    """Keyword hits per theme in one document."""
+    return THEME_MATCHER.scan(text)
+
+
+def detect_themes(texts) -> list[str]:
+    theme_scores = Counter()
+    for text in texts:
+        theme_scores.update(THEME_MATCHER.scan(text))
     return [theme for theme, _ in sorted(theme_scores.items(), key=lambda x: -x[1])]
 
 
+def iter_phrases(tokens):
+    """
+    Bigrams and trigrams of one document's PHRASE_TOKEN_RE tokens. A phrase
+    only spans keyword-like words (3+ letters, not a stop word), so stop
+    words, short words, numbers and punctuation all act as phrase boundaries.
+    """
+    prev2 = prev1 = None
+    for token in tokens:
+        if len(token) < 3 or not token.isalpha() or (token in STOP_WORDS and token not in PHRASE_WORDS):
+            prev2 = prev1 = None
+            continue
+        if prev1:
+            yield f"{prev1} {token}"
+            if prev2:
+                yield f"{prev2} {prev1} {token}"
+        prev2, prev1 = prev1, token
+
+
+def _xlogx(x: float) -> float:
+    return x * math.log(x) if x > 0 else 0.0
+
+
+def log_likelihood_ratio(joint: int, left: int, right: int, total: int) -> float:
+    """
+    Dunning's G² for `left` followed by `right` seen `joint` times among
+    `total` positions; 0 when they co-occur no more often than chance.
+    """
+    k12, k21 = max(left - joint, 0), max(right - joint, 0)
+    k22 = max(total - joint - k12 - k21, 0)
+    if joint * total <= left * right:
+        return 0.0
+    return 2 * (_xlogx(joint) + _xlogx(k12) + _xlogx(k21) + _xlogx(k22)
+                - _xlogx(joint + k12) - _xlogx(k21 + k22) - _xlogx(joint + k21) - _xlogx(k12 + k22)
+                + _xlogx(joint + k12 + k21 + k22))
+
+
 def get_most_active_source(articles: list) -> str:
     sources = [a.get("source", "") for a in articles if a.get("source")]
     if not sources:
@@ -74,50 +154,202 @@ def get_most_active_source(articles: list) -> str:
     return Counter(sources).most_common(1)[0][0]
 
 
-def analyze_trends(articles: list, papers: list, run_date: str = None) -> dict:
+def load_window(start: str = None, end: str = None, days_back: int = 7, stream: bool = False) -> tuple:
+    """
+    (articles, papers) stored in the corpus for [start, end); defaults to the
+    last `days_back` days. With stream=True both are lazy iterators.
+    """
+    end_dt = corpus.parse_ts(end) if end else datetime.now(timezone.utc)
+    start_dt = corpus.parse_ts(start) if start else end_dt - timedelta(days=days_back)
+    read = corpus.iter_window if stream else corpus.window
+    return read("news", start_dt, end_dt), read("research", start_dt, end_dt)
+
+
+class TrendCounter:
+    """
+    Single-pass accumulator behind analyze_trends: each article or paper is
+    tokenized, matched against the themes and dropped, so memory holds the
+    counters plus one document at a time however long the input is.
+
+    Phrase counts are bounded by PHRASE_CAP: whenever it is exceeded every
+    phrase seen no more than the current floor is dropped and the floor rises
+    (lossy counting), so a surviving phrase is undercounted by at most
+    `phrase_floor` and rare ones never pile up.
+    """
+
+    def __init__(self):
+        self.word_counts = Counter()
+        self.doc_freq = Counter()  # documents containing each word
+        self.phrase_counts = Counter()
+        self.phrase_floor = 0
+        self.phrase_word_counts = Counter()  # PHRASE_WORDS, which word_counts leaves out
+        self.token_count = 0
+        self.theme_scores = Counter()
+        self.theme_documents = Counter()  # documents assigned to each theme
+        self.source_counts = Counter()
+        self.article_count = 0
+        self.paper_count = 0
+        self.first_date = None
+        self.last_date = None
+
+    def _add(self, text: str, published_at: str):
+        # One tokenization feeds keywords, phrases and themes alike
+        tokens = PHRASE_TOKEN_RE.findall(text.lower())
+        words = [t for t in tokens if len(t) >= 3 and t.isalpha()]
+        keywords = [w for w in words if w not in STOP_WORDS]
+        self.word_counts.update(keywords)
+        self.doc_freq.update(set(keywords))
+        self.phrase_word_counts.update(w for w in words if w in PHRASE_WORDS)
+        self.token_count += sum(1 for w in words if w not in STOP_WORDS or w in PHRASE_WORDS)
+        self.phrase_counts.update(iter_phrases(tokens))
+        if len(self.phrase_counts) > PHRASE_CAP:
+            self._prune_phrases()
+        hits = THEME_MATCHER.scan_tokens(tokens)
+        self.theme_scores.update(hits)
+        self.theme_documents.update(hits.keys())
+        if published_at:
+            if self.first_date is None or published_at < self.first_date:
+                self.first_date = published_at
+            if self.last_date is None or published_at > self.last_date:
+                self.last_date = published_at
+
+    def _prune_phrases(self):
+        while len(self.phrase_counts) > PHRASE_CAP // 2:
+            self.phrase_floor += 1
+            floor = self.phrase_floor
+            self.phrase_counts = Counter({p: c for p, c in self.phrase_counts.items() if c > floor})
+
+    def collocations(self) -> list:
+        """
+        (phrase, count, llr) for every significant phrase, highest score first.
+        A bigram that only ever occurs inside one significant trigram is left
+        out in favour of the trigram.
+        """
+        def unigram(word):
+            return self.word_counts[word] or self.phrase_word_counts[word]
+
+        scored = {}
+        for phrase, count in self.phrase_counts.items():
+            if count < PHRASE_MIN_SUPPORT:
+                continue
+            head, _, last = phrase.rpartition(" ")
+            # A trigram is scored as its leading bigram followed by its last word
+            left = unigram(head) if " " not in head else self.phrase_counts[head]
+            score = log_likelihood_ratio(count, max(left, count), max(unigram(last), count), self.token_count)
+            if score >= PHRASE_MIN_LLR:
+                scored[phrase] = (count, score)
+
+        for phrase, (count, _) in list(scored.items()):
+            if phrase.count(" ") == 2:
+                first, second, third = phrase.split(" ")
+                for bigram in (f"{first} {second}", f"{second} {third}"):
+                    if bigram in scored and scored[bigram][0] <= count:
+                        del scored[bigram]
+        return sorted(((p, c, llr) for p, (c, llr) in scored.items()), key=lambda x: -x[2])
+
+    def add_article(self, article: dict):
+        self.article_count += 1
+        if article.get("source"):
+            self.source_counts[article["source"]] += 1
+        self._add(f"{article.get('title', '')}. {article.get('description', '')}", article.get("published_at"))
+
+    def add_paper(self, paper: dict):
+        self.paper_count += 1
+        self._add(f"{paper.get('title', '')}. {paper.get('abstract', '')}", paper.get("published_at"))
+
+    def term_dfs(self, phrases: list = None) -> dict:
+        """
+        Document frequency of every word plus the given (significant) phrases,
+        whose occurrence count stands in for it, as added to doc_freq.
+        """
+        phrases = self.collocations() if phrases is None else phrases
+        return {**self.doc_freq, **{phrase: count for phrase, count, _ in phrases}}
+
+    def term_counts(self, phrases: list = None) -> dict:
+        """Count of every word plus the given (significant) phrases, as stored in keyword_series."""
+        phrases = self.collocations() if phrases is None else phrases
+        return {**self.word_counts, **{phrase: count for phrase, count, _ in phrases}}
+
+    def result(self, top_n: int = 20, background: tuple = None, phrases: list = None) -> dict:
+        """
+        The analyze_trends output. `background` is doc_freq.background()'s
+        (documents, {term: df}) to rank keywords by TF-IDF; without it every
+        IDF is 1 and keywords rank by count.
+        """
+        trending_themes = [theme for theme, _ in sorted(self.theme_scores.items(), key=lambda x: -x[1])]
+        date_range = f"{self.first_date[:10]} to {self.last_date[:10]}" if self.first_date else "N/A"
+        phrases = self.collocations() if phrases is None else phrases
+        total_docs, dfs = background or (0, {})
+        candidates = list(self.word_counts.items()) + [(phrase, count) for phrase, count, _ in phrases]
+        keywords = heapq.nlargest(
+            top_n,
+            ((term, count, count * doc_freq.idf(dfs.get(term, 0), total_docs)) for term, count in candidates),
+            key=lambda x: (x[2], x[1]),
+        )
+        return {
+            "top_keywords": [
+                {"keyword": term, "count": count, "score": round(score, 1)} for term, count, score in keywords
+            ],
+            "top_phrases": [
+                {"phrase": phrase, "count": count, "score": round(score, 1)}
+                for phrase, count, score in phrases[:top_n]
+            ],
+            "trending_themes": trending_themes[:8],
+            "article_count": self.article_count,
+            "paper_count": self.paper_count,
+            "theme_document_counts": {theme: self.theme_documents[theme] for theme in trending_themes[:8]},
+            "emerging": [],  # filled in from keyword_series by analyze_stream
+            "fading": [],
+            "summary_stats": {
+                "total_sources": self.article_count + self.paper_count,
+                "date_range": date_range,
+                "most_active_source": (self.source_counts.most_common(1)[0][0]
+                                       if self.source_counts else "N/A"),
+            },
+        }
+
+
+def analyze_stream(articles=(), papers=(), top_n: int = 20, period: str = None, index: bool = False) -> dict:
+    """
+    analyze_trends() over any iterables of articles and papers (lists,
+    generators, corpus cursors). With `period` (an ISO week, see
+    doc_freq.period_key) keywords are ranked against the doc_freq index and
+    compared with the keyword_series weeks before it; with index=True the
+    week is then added to both.
+    """
+    counter = TrendCounter()
+    for article in articles:
+        counter.add_article(article)
+    for paper in papers:
+        counter.add_paper(paper)
+
+    phrases = counter.collocations()
+    if not period:
+        return counter.result(top_n, None, phrases)
+
+    term_dfs, term_counts = counter.term_dfs(phrases), counter.term_counts(phrases)
+    result = counter.result(top_n, doc_freq.background(term_dfs, exclude=period), phrases)
+    result.update(keyword_series.trends(period, term_counts, top_n=min(top_n, 10)))
+    if index and counter.article_count + counter.paper_count:
+        doc_freq.add_period(period, counter.article_count + counter.paper_count, term_dfs)
+        keyword_series.append(period, term_counts)
+    return result
+
+
+def analyze_trends(articles: list = None, papers: list = None, run_date: str = None, top_n: int = 20,
+                   start: str = None, end: str = None, index: bool = False) -> dict:
     if run_date is None:
         run_date = datetime.now(timezone.utc).isoformat()
+    if articles is None and papers is None:
+        articles, papers = load_window(start, end, stream=True)
+        logger.info("analyze_trends: streaming the window from the corpus")
 
-    texts = extract_text(articles, papers)
-    all_words = []
-    for text in texts:
-        all_words.extend(tokenize(text))
-
-    word_counts = Counter(all_words)
-    top_keywords = [
-        {"keyword": word, "count": count}
-        for word, count in word_counts.most_common(20)
-    ]
-
-    trending_themes = detect_themes(texts)
-
-    # Date range from article published_at
-    all_dates = [
-        a.get("published_at", "") for a in articles
-        if a.get("published_at")
-    ] + [
-        p.get("published_at", "") for p in papers
-        if p.get("published_at")
-    ]
-    all_dates_sorted = sorted(filter(None, all_dates))
-    date_range = (
-        f"{all_dates_sorted[0][:10]} to {all_dates_sorted[-1][:10]}"
-        if all_dates_sorted else "N/A"
-    )
+    period = doc_freq.period_key(corpus.parse_ts(end or run_date) or datetime.now(timezone.utc))
+    result = analyze_stream(articles or (), papers or (), top_n, period=period, index=index)
 
-    result = {
-        "top_keywords": top_keywords,
-        "trending_themes": trending_themes[:8],
-        "article_count": len(articles),
-        "paper_count": len(papers),
-        "summary_stats": {
-            "total_sources": len(articles) + len(papers),
-            "date_range": date_range,
-            "most_active_source": get_most_active_source(articles),
-        },
-    }
-
-    logger.info(f"analyze_trends: top theme={trending_themes[0] if trending_themes else 'N/A'}, keywords={len(top_keywords)}")
+    themes = result["trending_themes"]
+    logger.info(f"analyze_trends: {result['article_count']} articles, {result['paper_count']} papers, "
+                f"top theme={themes[0] if themes else 'N/A'}, keywords={len(result['top_keywords'])}")
     return result
 
 
@@ -125,8 +357,12 @@ if __name__ == "__main__":
     import sys
     payload = json.loads(sys.stdin.read()) if not sys.stdin.isatty() else {}
     output = analyze_trends(
-        articles=payload.get("articles", []),
-        papers=payload.get("papers", []),
+        articles=payload.get("articles"),
+        papers=payload.get("papers"),
         run_date=payload.get("run_date"),
+        top_n=payload.get("top_n", 20),
+        start=payload.get("start"),
+        end=payload.get("end"),
+        index=payload.get("index", False),
     )
     print(json.dumps(output, indent=2))
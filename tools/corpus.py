@@ -0,0 +1,276 @@
+"""
+Module: corpus.py
+Responsibility: Persistent SQLite store of every article and paper ever fetched.
+    Articles are unique by canonical URL (scheme/host lower-cased, "www." and
+    tracking params dropped), papers by version-stripped arxiv_id (the newest
+    version wins), and both are indexed on published_at so any time window can
+    be read back without touching the network. Which query returned which item
+    is kept alongside, with a per-(source, query) high-water mark — the latest
+    published_at — for incremental ingestion: a fetcher asks delta_start() where
+    its next request should begin, merge()s what it fetched, and assembles the
+    requested window from local data via window() (or iter_window() to stream it).
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+logger = logging.getLogger(__name__)
+
+# CORPUS_DIR relocates every store kept here (corpus, doc_freq, keyword_series), e.g. tools/standin.py
+CORPUS_DIR = os.environ.get("CORPUS_DIR") or os.path.join(os.path.dirname(__file__), "..", "temp", "corpus")
+DB_PATH = os.path.join(CORPUS_DIR, "corpus.sqlite")
+BATCH_SIZE = 500  # rows per insert transaction
+
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "cmpid", "ocid"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url_canonical TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT,
+    source TEXT,
+    description TEXT,
+    published_at TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_published_at ON articles (published_at);
+
+CREATE TABLE IF NOT EXISTS papers (
+    arxiv_id TEXT PRIMARY KEY,  -- version stripped
+    version INTEGER NOT NULL DEFAULT 0,
+    title TEXT,
+    authors TEXT,               -- JSON list
+    abstract TEXT,
+    categories TEXT,            -- JSON list
+    published_at TEXT
+);
+CREATE INDEX IF NOT EXISTS papers_published_at ON papers (published_at);
+
+CREATE TABLE IF NOT EXISTS query_items (
+    source TEXT NOT NULL,
+    query TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    PRIMARY KEY (source, query, item_key)
+);
+
+CREATE TABLE IF NOT EXISTS marks (
+    source TEXT NOT NULL,
+    query TEXT NOT NULL,
+    high_water_mark TEXT,
+    covered_from TEXT,
+    PRIMARY KEY (source, query)
+);
+"""
+
+
+def parse_ts(value: str):
+    """ISO8601 (with or without Z) → aware datetime, or None."""
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _ts_key(value) -> str:
+    """Normalise a timestamp to UTC 'YYYY-MM-DDTHH:MM:SSZ' so SQLite can range-scan it as text."""
+    dt = parse_ts(value) if isinstance(value, str) else value
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ") if dt else ""
+
+
+def canonical_url(url: str) -> str:
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower()
+    host = host[4:] if host.startswith("www.") else host
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parsed.path.rstrip("/") or "/"
+    return f"{parsed.scheme.lower() or 'https'}://{host}{path}" + (f"?{urlencode(query)}" if query else "")
+
+
+def split_arxiv_id(arxiv_id: str) -> tuple:
+    """'2401.01234v3' → ('2401.01234', 3); unversioned IDs get version 0."""
+    match = re.match(r"^(.*?)(?:v(\d+))?$", arxiv_id.strip())
+    return match.group(1), int(match.group(2) or 0)
+
+
+def _connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")  # readers never block the fetchers' writers
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _article_row(a: dict) -> tuple:
+    return (canonical_url(a["url"]), a["url"], a.get("title", ""), a.get("source", ""),
+            a.get("description", ""), _ts_key(a.get("published_at")))
+
+
+def _paper_row(p: dict) -> tuple:
+    base, version = split_arxiv_id(p["arxiv_id"])
+    return (base, version, p.get("title", ""), json.dumps(p.get("authors", [])), p.get("abstract", ""),
+            json.dumps(p.get("categories", [])), _ts_key(p.get("published_at")))
+
+
+INSERTS = {
+    "news": (
+        "INSERT OR IGNORE INTO articles (url_canonical, url, title, source, description, published_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        _article_row, "url",
+    ),
+    "research": (
+        "INSERT INTO papers (arxiv_id, version, title, authors, abstract, categories, published_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(arxiv_id) DO UPDATE SET version = excluded.version, title = excluded.title, "
+        "authors = excluded.authors, abstract = excluded.abstract, categories = excluded.categories "
+        "WHERE excluded.version > papers.version",
+        _paper_row, "arxiv_id",
+    ),
+}
+
+
+def add(source: str, query: str, items: list) -> int:
+    """
+    Upsert fetched items ("news" articles or "research" papers) in batched
+    transactions and remember that `query` returned them. Returns how many
+    items the query had not returned before.
+    """
+    sql, to_row, id_key = INSERTS[source]
+    rows = [to_row(i) for i in items if i.get(id_key)]
+    new = 0
+    conn = _connect()
+    try:
+        for offset in range(0, len(rows), BATCH_SIZE):
+            batch = rows[offset:offset + BATCH_SIZE]
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(sql, batch)
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO query_items (source, query, item_key) VALUES (?, ?, ?)",
+                [(source, query, row[0]) for row in batch],
+            )
+            new += conn.total_changes - before
+            conn.execute("COMMIT")
+    finally:
+        conn.close()
+    logger.info(f"corpus: stored {len(rows)} {source} items for '{query}' ({new} new)")
+    return new
+
+
+def delta_start(source: str, query: str, window_start: datetime) -> datetime:
+    """
+    Where the next fetch for this window must start: the high-water mark when
+    the corpus already covers the window's start, otherwise the window start.
+    """
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT high_water_mark, covered_from FROM marks WHERE source = ? AND query = ?",
+                           (source, query)).fetchone()
+    finally:
+        conn.close()
+    hwm, covered_from = (parse_ts(row[0]), parse_ts(row[1])) if row else (None, None)
+    if hwm is not None and covered_from is not None and covered_from <= window_start <= hwm:
+        return hwm
+    return window_start
+
+
+def merge(source: str, query: str, items: list, fetched_from: datetime, fetched_to: datetime,
+          complete: bool) -> int:
+    """
+    add() items fetched for [fetched_from, fetched_to) and move the query's
+    high-water mark. The mark and coverage only move when the fetch was
+    `complete` (not cut off by a page limit), so a truncated fetch never leaves
+    a silent gap — it is simply requested again next time. A fetch that
+    touches the covered span extends it; one that starts after the mark (the
+    usual weekly run, whose window begins after last week's newest item)
+    replaces it, since nothing before its window is needed any more.
+    """
+    new = add(source, query, items)
+    if not complete:
+        logger.warning(f"corpus: {source} fetch for '{query}' hit the page limit — high-water mark not advanced")
+        return new
+
+    latest = max(filter(None, (parse_ts(i.get("published_at")) for i in items)), default=None)
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT high_water_mark, covered_from FROM marks WHERE source = ? AND query = ?",
+                           (source, query)).fetchone()
+        hwm, covered_from = (parse_ts(row[0]), parse_ts(row[1])) if row else (None, None)
+        contiguous = (covered_from is None or hwm is None
+                      or covered_from <= fetched_from <= hwm
+                      or fetched_from < covered_from <= fetched_to)
+        if not contiguous and fetched_from > hwm:
+            hwm, covered_from = latest or fetched_from, fetched_from
+            contiguous = True
+        if contiguous:
+            if latest is not None and (hwm is None or latest > hwm):
+                hwm = latest
+            if covered_from is None or fetched_from < covered_from:
+                covered_from = fetched_from
+            conn.execute(
+                "INSERT INTO marks (source, query, high_water_mark, covered_from) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(source, query) DO UPDATE SET high_water_mark = excluded.high_water_mark, "
+                "covered_from = excluded.covered_from",
+                (source, query, hwm.isoformat() if hwm else None, covered_from.isoformat()),
+            )
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    return new
+
+
+def oldest_published(items: list):
+    """
+    Earliest published_at among newest-first results: a fetch cut off by its
+    budget or page limit still covers [that, end) without a gap.
+    """
+    return min(filter(None, (parse_ts(i.get("published_at")) for i in items)), default=None)
+
+
+def iter_window(source: str, start: datetime, end: datetime, query: str = None, limit: int = None):
+    """
+    Stored items published in [start, end), newest first, in the fetchers'
+    output format. With `query`, only items that query has returned. Rows are
+    yielded straight off the cursor, so callers that stream (e.g.
+    analyze_trends) never hold the whole window in memory.
+    """
+    table, key, columns = (
+        ("articles", "url_canonical", "url, title, source, description, published_at") if source == "news"
+        else ("papers", "arxiv_id", "arxiv_id, version, title, authors, abstract, categories, published_at")
+    )
+    sql = f"SELECT {columns} FROM {table} WHERE published_at >= ? AND published_at < ?"
+    # Stored timestamps have whole seconds; round the bounds up to match them exactly
+    params = [_ts_key(start + timedelta(microseconds=999999)), _ts_key(end + timedelta(microseconds=999999))]
+    if query is not None:
+        sql += f" AND {key} IN (SELECT item_key FROM query_items WHERE source = ? AND query = ?)"
+        params += [source, query]
+    sql += " ORDER BY published_at DESC"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+
+    conn = _connect()
+    conn.row_factory = sqlite3.Row
+    try:
+        for row in conn.execute(sql, params):
+            r = dict(row)
+            if source == "research":
+                version = r.pop("version")
+                r["arxiv_id"] = f"{r['arxiv_id']}v{version}" if version else r["arxiv_id"]
+                r["authors"] = json.loads(r["authors"] or "[]")
+                r["categories"] = json.loads(r["categories"] or "[]")
+            yield r
+    finally:
+        conn.close()
+
+
+def window(source: str, start: datetime, end: datetime, query: str = None, limit: int = None) -> list:
+    """iter_window() as a list."""
+    return list(iter_window(source, start, end, query, limit))
@@ -0,0 +1,144 @@
+"""
+Module: doc_freq.py
+Responsibility: Persistent document-frequency index of keywords across runs.
+    Each analysed period (one ISO week) adds, for every keyword and phrase, the
+    number of its documents that contained it; a period is only ever added
+    once, so re-running a week (--resume, batch profiles) does not count its
+    documents twice. analyze_trends reads the counts back as the historical
+    background for TF-IDF ranking, minus the week being analysed: each
+    period's own frequencies are kept (compressed) so a re-run of an indexed
+    week (--resume) is ranked exactly as the original run was.
+
+    The index is one SQLite table keyed by term (WITHOUT ROWID, so each term is
+    stored once, in the primary-key B-tree). A run fetches the counts for all
+    of its terms in a few batched queries and then looks each one up in a dict.
+    Once the table holds more than MAX_TERMS terms, the rarest are dropped;
+    a dropped term reads as never seen, which only nudges its IDF up.
+"""
+
+import json
+import logging
+import math
+import os
+import sqlite3
+import zlib
+from datetime import datetime, timezone
+
+import corpus
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.path.join(corpus.CORPUS_DIR, "doc_freq.sqlite")
+BATCH_SIZE = 500     # terms per lookup query (SQLite's variable limit is 999 on older builds)
+MAX_TERMS = 500_000  # terms kept before the rarest are pruned
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT PRIMARY KEY,
+    df INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS periods (
+    period TEXT PRIMARY KEY,
+    docs INTEGER NOT NULL,
+    added_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS period_terms (
+    period TEXT PRIMARY KEY,
+    dfs BLOB NOT NULL  -- zlib(JSON {term: df}) of that period alone
+);
+"""
+
+
+def _connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def period_key(when: datetime) -> str:
+    """The ISO week a run belongs to, e.g. '2026-W11'."""
+    year, week, _ = when.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def idf(df: int, total_docs: int) -> float:
+    """Smoothed inverse document frequency; 1.0 for every term while the index is empty."""
+    return math.log((1 + total_docs) / (1 + df)) + 1
+
+
+def background(terms, exclude: str = None) -> tuple:
+    """
+    (documents indexed so far, {term: df}) for the given terms, leaving out
+    the `exclude` period's own contribution; unseen terms are left out.
+    """
+    terms = list(terms)
+    conn = _connect()
+    try:
+        total = conn.execute("SELECT COALESCE(SUM(docs), 0) FROM periods").fetchone()[0]
+        own_docs, own_dfs = 0, {}
+        if exclude:
+            row = conn.execute("SELECT p.docs, t.dfs FROM periods p JOIN period_terms t USING (period) "
+                               "WHERE period = ?", (exclude,)).fetchone()
+            if row:
+                own_docs, own_dfs = row[0], json.loads(zlib.decompress(row[1]))
+        dfs = {}
+        if total > own_docs:
+            for i in range(0, len(terms), BATCH_SIZE):
+                chunk = terms[i:i + BATCH_SIZE]
+                sql = f"SELECT term, df FROM terms WHERE term IN ({', '.join('?' * len(chunk))})"
+                dfs.update(conn.execute(sql, chunk))
+    finally:
+        conn.close()
+    for term, df in own_dfs.items():
+        if term in dfs:
+            dfs[term] = max(dfs[term] - df, 0)
+    return total - own_docs, dfs
+
+
+def add_period(period: str, docs: int, term_dfs: dict) -> bool:
+    """
+    Add one period's document frequencies; False (and no change) if the
+    period is already in the index.
+    """
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM periods WHERE period = ?", (period,)).fetchone():
+                conn.execute("ROLLBACK")
+                logger.info(f"doc_freq: {period} already indexed")
+                return False
+            conn.execute("INSERT INTO periods (period, docs, added_at) VALUES (?, ?, ?)",
+                         (period, docs, datetime.now(timezone.utc).isoformat()))
+            conn.execute("INSERT INTO period_terms (period, dfs) VALUES (?, ?)",
+                         (period, zlib.compress(json.dumps(term_dfs).encode())))
+            conn.executemany(
+                "INSERT INTO terms (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df",
+                term_dfs.items(),
+            )
+            pruned = _prune(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+    logger.info(f"doc_freq: indexed {period} ({docs} documents, {len(term_dfs)} terms"
+                + (f", pruned {pruned} rare terms)" if pruned else ")"))
+    return True
+
+
+def _prune(conn: sqlite3.Connection) -> int:
+    """Drop the rarest terms until at most 90% of MAX_TERMS remain."""
+    count = conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+    if count <= MAX_TERMS:
+        return 0
+    pruned, floor = 0, 0
+    while count - pruned > MAX_TERMS * 9 // 10:
+        floor += 1
+        pruned += conn.execute("DELETE FROM terms WHERE df <= ?", (floor,)).rowcount
+    return pruned
@@ -0,0 +1,122 @@
+"""
+Module: event_log.py
+Responsibility: Append-only JSONL event stream for pipeline runs.
+    Every event (run_started, step_started, step_finished, http_request, retry,
+    artifact_written, run_finished) is written as one JSON line and flushed
+    immediately, so a crashed or killed run still leaves structured data behind.
+    rebuild_summary() turns a complete or partial stream back into a run summary.
+
+Usage (watch a live run or inspect a killed one):
+    python tools/event_log.py temp/logs/run_YYYYMMDD_HHMMSS.jsonl [--follow]
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+_active = None
+
+
+class EventLog:
+    def __init__(self, path: str):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Append mode: each line lands at the end even when forked workers share the file
+        self._file = open(self.path, "a", buffering=1)
+        self._lock = threading.Lock()
+
+    def write(self, event: str, **fields):
+        record = {"ts": datetime.now(timezone.utc).isoformat(), "event": event, "pid": os.getpid(), **fields}
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def open_log(path: str) -> EventLog:
+    """Start streaming events for this process (and any workers it forks) to `path`."""
+    global _active
+    close_log()
+    _active = EventLog(path)
+    return _active
+
+
+def close_log():
+    global _active
+    if _active is not None:
+        _active.close()
+        _active = None
+
+
+def emit(event: str, **fields):
+    """Write one event to the active log; a no-op when no log is open (e.g. tools run standalone)."""
+    if _active is not None:
+        _active.write(event, **fields)
+
+
+def read_events(path: str) -> list:
+    """Parse a JSONL stream, ignoring a half-written final line from a killed process."""
+    events = []
+    with open(path) as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+    return events
+
+
+def rebuild_summary(events: list) -> dict:
+    summary = {
+        "run_id": None,
+        "status": "running",
+        "started_at": None,
+        "last_event_at": None,
+        "steps": {},
+        "http_requests": 0,
+        "retries": 0,
+        "artifacts": [],
+    }
+    for e in events:
+        kind = e.get("event")
+        summary["last_event_at"] = e.get("ts")
+        if kind == "run_started":
+            summary["run_id"] = e.get("run_id")
+            summary["started_at"] = e.get("ts")
+        elif kind == "run_finished":
+            summary["status"] = e.get("status", "finished")
+        elif kind == "step_started":
+            summary["steps"][e["step"]] = {"status": "running", "started_at": e.get("ts")}
+        elif kind == "step_finished":
+            entry = summary["steps"].setdefault(e["step"], {})
+            entry.update({k: v for k, v in e.items() if k not in ("ts", "event", "pid", "step")})
+            entry["finished_at"] = e.get("ts")
+        elif kind == "http_request":
+            summary["http_requests"] += 1
+        elif kind == "retry":
+            summary["retries"] += 1
+        elif kind == "artifact_written":
+            summary["artifacts"].append({"path": e.get("path"), "bytes": e.get("bytes"), "step": e.get("step")})
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarise a (possibly partial) run event stream")
+    parser.add_argument("path", help="temp/logs/run_*.jsonl")
+    parser.add_argument("--follow", action="store_true", help="Re-print the summary every 2s until the run ends")
+    args = parser.parse_args()
+
+    while True:
+        summary = rebuild_summary(read_events(args.path))
+        print(json.dumps(summary, indent=2))
+        if not args.follow or summary["status"] != "running":
+            break
+        time.sleep(2)
@@ -1,82 +1,332 @@
 """
 Tool: fetch_news.py
-Responsibility: Fetch AI-related news articles from NewsAPI for the past N days.
-Input:  {"days_back": int, "query": str, "max_articles": int}
-Output: {"articles": [...], "count": int, "fetched_at": str}
+Responsibility: Fetch AI-related news articles from NewsAPI for the past N days,
+                or for an explicit [start, end) window when both are given.
+                `query` may be a list of topic queries: they are fetched
+                concurrently, merged with URL + title dedup, and each article
+                lists the queries that matched it under "queries". If any
+                query fails the fetch fails, unless partial_ok=True lets it
+                continue with the others (listed under "failed_queries").
+                With incremental=True only articles newer than the query's
+                high-water mark are requested, newest first and within the
+                max_articles budget; the window is then assembled from the
+                local corpus (see corpus.py), newest first rather than by
+                relevance. A delta cut off by the budget still advances the
+                mark over the span it returned.
+                Every fetched article is stored in the corpus either way.
+                Results are paginated past NewsAPI's 100-per-page limit; with
+                shard_by_day=True each day of the window is paged in parallel.
+                max_articles is one budget shared by every query, page and
+                shard, so outstanding pages stop once it is spent.
+                afetch_news() is the asyncio version; fetch_news() wraps it.
+Input:  {"days_back": int, "query": str | [str], "max_articles": int,
+         "start": ISO8601 (optional), "end": ISO8601 (optional),
+         "incremental": bool (optional), "shard_by_day": bool (optional),
+         "partial_ok": bool (optional)}
+Output: {"articles": [...], "count": int, "fetched_at": str,
+         "failed_queries": [str] (partial_ok only: the queries that failed)}
 """
 
+import asyncio
 import os
 import json
-import time
 import logging
+import re
 from datetime import datetime, timedelta, timezone
 
 import requests
 from dotenv import load_dotenv
 
+import corpus
+import http_client
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-NEWS_API_KEY = os.environ["NEWS_API_KEY"]
-NEWS_API_URL = "https://newsapi.org/v2/everything"
+NEWS_API_URL = os.environ.get("NEWS_API_URL", "https://newsapi.org/v2/everything")  # overridable, e.g. tools/standin.py
 MAX_RETRIES = 3
-RETRY_DELAY = 5  # seconds
+PAGE_SIZE_MAX = 100  # NewsAPI's cap per request
+MAX_PAGES = 10       # per query and sub-window
+
+
+def _api_key() -> str:
+    # Read at call time, not import time, so importing this module never requires the key
+    key = os.environ.get("NEWS_API_KEY", "")
+    if not key:
+        raise EnvironmentError("NEWS_API_KEY not set in environment.")
+    return key
+
+
+def _window(days_back: int, start: str = None, end: str = None) -> tuple:
+    """Resolve the [start, end) fetch window; an explicit end replaces "now"."""
+    end_dt = datetime.fromisoformat(end) if end else datetime.now(timezone.utc)
+    start_dt = datetime.fromisoformat(start) if start else end_dt - timedelta(days=days_back)
+    if start_dt.tzinfo is None:
+        start_dt = start_dt.replace(tzinfo=timezone.utc)
+    if end_dt.tzinfo is None:
+        end_dt = end_dt.replace(tzinfo=timezone.utc)
+    return start_dt, end_dt
+
+
+class _Budget:
+    """
+    Articles still wanted across every query, page and day shard of one fetch
+    (None = unbounded). share() carves out a query's part: it is capped at
+    that share and draws on the parent, so the whole fetch never exceeds it.
+    Only distinct articles are charged: `seen` holds the canonical URLs
+    claimed so far and is shared with every share of the fetch.
+    """
+
+    def __init__(self, limit: int = None, parent: "_Budget" = None):
+        self.limit = limit
+        self.remaining = limit
+        self.parent = parent
+        self.seen = parent.seen if parent is not None else set()
+
+    @property
+    def exhausted(self) -> bool:
+        own = self.remaining is not None and self.remaining <= 0
+        return own or (self.parent is not None and self.parent.exhausted)
+
+    def share(self, parts: int) -> "_Budget":
+        return _Budget(None if self.limit is None else -(-self.limit // parts), parent=self)
 
+    def take(self, n: int) -> int:
+        """Claim up to `n` articles; returns how many may be kept."""
+        granted = n if self.remaining is None else max(0, min(n, self.remaining))
+        if self.parent is not None:
+            granted = self.parent.take(granted)
+        if self.remaining is not None:
+            self.remaining -= granted
+        return granted
 
-def fetch_news(days_back: int = 7, query: str = "artificial intelligence", max_articles: int = 50) -> dict:
-    from_date = (datetime.now(timezone.utc) - timedelta(days=days_back)).strftime("%Y-%m-%d")
-    to_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    def claim(self, articles: list) -> list:
+        """
+        The leading `articles` that fit the budget. Articles another page,
+        shard or query already claimed ride along uncharged (merge_results
+        drops them later), so overlaps never crowd out distinct articles.
+        """
+        keys = [corpus.canonical_url(a["url"]) if a.get("url") else None for a in articles]
+        fresh, pending = [], set()
+        for key in keys:
+            fresh.append(key is None or (key not in self.seen and key not in pending))
+            pending.add(key)
+        granted = self.take(sum(fresh))
+        kept = []
+        for article, key, new in zip(articles, keys, fresh):
+            if new:
+                if not granted:
+                    break
+                granted -= 1
+                self.seen.add(key)
+            kept.append(article)
+        return kept
 
+
+def _day_shards(start_dt: datetime, end_dt: datetime) -> list:
+    """[start, end) cut into consecutive sub-windows of at most one day, newest first."""
+    shards, cursor = [], start_dt
+    while cursor < end_dt:
+        shards.append((cursor, min(cursor + timedelta(days=1), end_dt)))
+        cursor += timedelta(days=1)
+    return shards[::-1]
+
+
+def _interleave(lists: list):
+    """Round-robin by rank — a0, b0, c0, a1, b1, … — so no list crowds out the others."""
+    for rank in range(max(map(len, lists), default=0)):
+        for items in lists:
+            if rank < len(items):
+                yield items[rank]
+
+
+async def _fetch_pages(query: str, start_dt: datetime, end_dt: datetime, sort_by: str, budget: _Budget,
+                       page_size: int) -> tuple:
+    """
+    Page through one query over [start_dt, end_dt) until the results run out,
+    MAX_PAGES is reached or the budget is spent. Returns (articles, complete),
+    where complete means every matching article was retrieved.
+    """
+    # Whole hours, so a rerun within the hour sends the same request and http_cache can answer it
+    from_hour = start_dt.replace(minute=0, second=0, microsecond=0)
+    to_hour = end_dt.replace(minute=0, second=0, microsecond=0)
+    if to_hour < end_dt:
+        to_hour += timedelta(hours=1)
     params = {
         "q": query,
-        "from": from_date,
-        "to": to_date,
+        "from": from_hour.strftime("%Y-%m-%dT%H:%M:%S"),
+        # NewsAPI's "to" is inclusive; step back a second from the exclusive end
+        "to": (to_hour - timedelta(seconds=1)).strftime("%Y-%m-%dT%H:%M:%S"),
         "language": "en",
-        "sortBy": "relevancy",
-        "pageSize": min(max_articles, 100),
-        "apiKey": NEWS_API_KEY,
+        "sortBy": sort_by,
+        "pageSize": page_size,
+        "apiKey": _api_key(),
     }
 
     articles = []
-    for attempt in range(1, MAX_RETRIES + 1):
+    for page in range(1, MAX_PAGES + 1):
+        if budget.exhausted:
+            return articles, False  # another query or shard already filled the budget
         try:
-            response = requests.get(NEWS_API_URL, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("status") != "ok":
-                raise ValueError(f"NewsAPI error: {data.get('message', 'Unknown error')}")
-
-            for item in data.get("articles", []):
-                articles.append({
-                    "title": item.get("title", ""),
-                    "source": item.get("source", {}).get("name", ""),
-                    "url": item.get("url", ""),
-                    "published_at": item.get("publishedAt", ""),
-                    "description": item.get("description", "") or "",
-                })
-            break
-
-        except requests.exceptions.RateLimitError:
+            response = await http_client.aget(NEWS_API_URL, params={**params, "page": page}, timeout=15,
+                                              attempts=MAX_RETRIES)
+        except http_client.RateLimitError:
             logger.error("NewsAPI rate limit reached.")
             raise
+        except requests.exceptions.HTTPError as e:
+            if page > 1 and e.response is not None and e.response.status_code == 426:
+                logger.warning(f"fetch_news: plan result limit reached for '{query}' after page {page - 1}")
+                return articles, False
+            raise RuntimeError(f"fetch_news failed after {MAX_RETRIES} retries: {e}") from e
         except requests.exceptions.RequestException as e:
-            logger.warning(f"Attempt {attempt}/{MAX_RETRIES} failed: {e}")
-            if attempt == MAX_RETRIES:
-                raise RuntimeError(f"fetch_news failed after {MAX_RETRIES} retries: {e}") from e
-            time.sleep(RETRY_DELAY)
+            raise RuntimeError(f"fetch_news failed after {MAX_RETRIES} retries: {e}") from e
+
+        data = response.json()
+        if data.get("status") != "ok":
+            raise ValueError(f"NewsAPI error: {data.get('message', 'Unknown error')}")
+
+        items = [
+            {
+                "title": item.get("title", ""),
+                "source": item.get("source", {}).get("name", ""),
+                "url": item.get("url", ""),
+                "published_at": item.get("publishedAt", ""),
+                "description": item.get("description", "") or "",
+            }
+            for item in data.get("articles", [])
+        ]
+        # The request was widened to whole hours; keep only this window's articles
+        # so adjacent day shards never return the same ones
+        in_window = [a for a in items if start_dt <= (corpus.parse_ts(a["published_at"]) or start_dt) < end_dt]
+        kept = budget.claim(in_window)
+        articles.extend(kept)
+        if len(kept) < len(in_window):
+            return articles, False
+        if len(items) < page_size or page * page_size >= data.get("totalResults", 0):
+            return articles, True
+    return articles, False
+
+
+async def _fetch_query(query: str, start_dt: datetime, end_dt: datetime, max_articles: int, incremental: bool,
+                       budget: _Budget, page_size: int, shard_by_day: bool = False) -> list:
+    """
+    Articles for one NewsAPI query over [start_dt, end_dt), paginated and
+    optionally sharded by day, drawing on the fetch-wide `budget`.
+    """
+    if incremental:
+        # Only the delta since the high-water mark, newest first, so a cut-off still leaves no gap
+        fetch_from = corpus.delta_start("news", query, start_dt)
+        sort_by = "publishedAt"
+    else:
+        fetch_from = start_dt
+        sort_by = "relevancy"
+
+    shards = _day_shards(fetch_from, end_dt) if shard_by_day else [(fetch_from, end_dt)]
+    outcomes = await asyncio.gather(*(_fetch_pages(query, s, e, sort_by, budget, page_size) for s, e in shards))
+
+    articles = list(_interleave([found for found, _ in outcomes]))
+    complete = all(done for _, done in outcomes)
+
+    if incremental:
+        # Shards are newest first: coverage runs back through every complete shard and
+        # into the first cut-off one as far as its oldest article
+        covered_from = end_dt
+        for (shard_start, _), (found, done) in zip(shards, outcomes):
+            if done:
+                covered_from = shard_start
+                continue
+            covered_from = corpus.oldest_published(found) or covered_from
+            break
+        corpus.merge("news", query, articles, fetched_from=covered_from, fetched_to=end_dt,
+                     complete=covered_from < end_dt)
+        logger.info(f"fetch_news: delta of {len(articles)} articles for '{query}' since {fetch_from.isoformat()}")
+        return corpus.window("news", start_dt, end_dt, query=query, limit=max_articles)
+    corpus.add("news", query, articles)
+    return articles
+
+
+def _title_key(title: str) -> str:
+    """Syndicated copies of a story differ in punctuation/case, not words."""
+    return " ".join(re.findall(r"[a-z0-9]+", title.lower()))
+
+
+def merge_results(per_query: dict) -> list:
+    """
+    Merge {query: [articles]} into one list, deduplicated by canonical URL and
+    by normalised title, tagging each article with every query that returned
+    it. Queries are interleaved rank by rank so a budget cut keeps each query's
+    best results rather than the first query's whole list.
+    """
+    merged, by_url, by_title = [], {}, {}
+    tagged = [[(query, article) for article in articles] for query, articles in per_query.items()]
+    for query, article in _interleave(tagged):
+        url_key = corpus.canonical_url(article["url"]) if article.get("url") else None
+        title_key = _title_key(article.get("title", ""))
+        seen = by_url.get(url_key) if url_key else None
+        if seen is None and title_key:
+            seen = by_title.get(title_key)
+        if seen is not None:
+            if query not in seen["queries"]:
+                seen["queries"].append(query)
+            continue
+        article = {**article, "queries": [query]}
+        merged.append(article)
+        if url_key:
+            by_url[url_key] = article
+        if title_key:
+            by_title[title_key] = article
+    return merged
+
+
+async def afetch_news(days_back: int = 7, query="artificial intelligence", max_articles: int = 50,
+                      start: str = None, end: str = None, incremental: bool = False,
+                      shard_by_day: bool = False, partial_ok: bool = False) -> dict:
+    start_dt, end_dt = _window(days_back, start, end)
+    queries = [query] if isinstance(query, str) else list(dict.fromkeys(query))
+
+    # One budget for every query; each query may fill only its even share of it
+    budget = _Budget(max_articles)
+    page_size = max(1, min(-(-max_articles // len(queries)), PAGE_SIZE_MAX))
+
+    # All queries and shards share one event loop; http_client bounds the requests in
+    # flight per host and rate_limit.py paces newsapi.org across every process
+    outcomes = await asyncio.gather(
+        *(_fetch_query(q, start_dt, end_dt, max_articles, incremental, budget.share(len(queries)), page_size,
+                       shard_by_day)
+          for q in queries),
+        return_exceptions=True,
+    )
+    per_query = {q: r for q, r in zip(queries, outcomes) if not isinstance(r, BaseException)}
+    failed = {q: r for q, r in zip(queries, outcomes) if isinstance(r, BaseException)}
+
+    for q, e in failed.items():
+        logger.warning(f"fetch_news: query '{q}' failed: {e}")
+    if failed and not (partial_ok and per_query):
+        raise next(iter(failed.values()))
+
+    articles = merge_results({q: per_query[q] for q in queries if q in per_query})[:max_articles]
 
     result = {
         "articles": articles,
         "count": len(articles),
         "fetched_at": datetime.now(timezone.utc).isoformat(),
     }
+    if failed:
+        result["failed_queries"] = list(failed)
 
-    logger.info(f"fetch_news: retrieved {len(articles)} articles")
+    logger.info(f"fetch_news: retrieved {len(articles)} articles for {len(per_query)} queries")
     return result
 
 
+def fetch_news(days_back: int = 7, query="artificial intelligence", max_articles: int = 50,
+               start: str = None, end: str = None, incremental: bool = False, shard_by_day: bool = False,
+               partial_ok: bool = False) -> dict:
+    """Blocking wrapper around afetch_news()."""
+    return http_client.run(afetch_news(days_back, query, max_articles, start, end, incremental, shard_by_day,
+                                       partial_ok))
+
+
 if __name__ == "__main__":
     import sys
     payload = json.loads(sys.stdin.read()) if not sys.stdin.isatty() else {}
@@ -84,5 +334,10 @@ if __name__ == "__main__":
         days_back=payload.get("days_back", 7),
         query=payload.get("query", "artificial intelligence machine learning"),
         max_articles=payload.get("max_articles", 50),
+        start=payload.get("start"),
+        end=payload.get("end"),
+        incremental=payload.get("incremental", False),
+        partial_ok=payload.get("partial_ok", False),
+        shard_by_day=payload.get("shard_by_day", False),
     )
     print(json.dumps(output, indent=2))
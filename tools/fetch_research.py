@@ -1,98 +1,278 @@
 """
 Tool: fetch_research.py
-Responsibility: Fetch AI research papers from ArXiv for the past N days.
-Input:  {"days_back": int, "query": str, "max_papers": int}
-Output: {"papers": [...], "count": int, "fetched_at": str}
+Responsibility: Fetch AI research papers from ArXiv for the past N days,
+                or for an explicit [start, end) window when both are given.
+                `query` may be a list of categories ("cs.AI") and/or text
+                queries: they are fetched concurrently, deduplicated by arXiv
+                ID without version (latest version kept), and each paper lists
+                the queries/categories that returned it under "queries". If
+                any query fails the fetch fails, unless partial_ok=True lets it
+                continue with the others (listed under "failed_queries").
+                With incremental=True only papers submitted after the query's
+                high-water mark are requested, at most max_papers of them; the
+                window is then assembled from the local corpus (see corpus.py),
+                newest first. A delta cut off by max_papers still advances the
+                mark over the span it returned.
+                Every fetched paper is stored in the corpus either way.
+                The window is pushed into the query as a submittedDate range and
+                paged with `start` offsets until the results run out, the cutoff
+                is reached or max_papers have arrived. Pages are parsed as a
+                stream (iter_papers), one entry at a time.
+                afetch_research() is the asyncio version; fetch_research() wraps it.
+Input:  {"days_back": int, "query": str | [str], "max_papers": int,
+         "start": ISO8601 (optional), "end": ISO8601 (optional),
+         "incremental": bool (optional), "partial_ok": bool (optional)}
+Output: {"papers": [...], "count": int, "fetched_at": str,
+         "failed_queries": [str] (partial_ok only: the queries that failed)}
 """
 
+import asyncio
+import io
 import json
-import time
 import logging
+import os
+import re
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, timezone
 
 import requests
 
+import corpus
+import http_client
+
 logger = logging.getLogger(__name__)
 
-ARXIV_API_URL = "http://export.arxiv.org/api/query"
+ARXIV_API_URL = os.environ.get("ARXIV_API_URL", "http://export.arxiv.org/api/query")  # overridable, e.g. tools/standin.py
 MAX_RETRIES = 3
-RETRY_DELAY = 5  # seconds
 ARXIV_NS = "http://www.w3.org/2005/Atom"
+OPENSEARCH_NS = "http://a9.com/-/spec/opensearch/1.1/"
+ARXIV_EXT_NS = "http://arxiv.org/schemas/atom"
+PAGE_SIZE = 100
+MAX_PAGES = 20
 
+CATEGORY_RE = re.compile(r"^[a-z-]+\.[A-Za-z-]+$")        # cs.AI, stat.ML, q-bio.NC
+FIELD_PREFIX_RE = re.compile(r"^(all|ti|au|abs|cat|co|jr|rn|id):")
 
-def fetch_research(days_back: int = 7, query: str = "artificial intelligence", max_papers: int = 30) -> dict:
-    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_back)
+_ENTRY = f"{{{ARXIV_NS}}}entry"
+_TITLE = f"{{{ARXIV_NS}}}title"
+_SUMMARY = f"{{{ARXIV_NS}}}summary"
+_ID = f"{{{ARXIV_NS}}}id"
+_PUBLISHED = f"{{{ARXIV_NS}}}published"
+_AUTHOR = f"{{{ARXIV_NS}}}author"
+_NAME = f"{{{ARXIV_NS}}}name"
+_CATEGORY = f"{{{ARXIV_NS}}}category"
+_PRIMARY_CATEGORY = f"{{{ARXIV_EXT_NS}}}primary_category"
+_TOTAL_RESULTS = f"{{{OPENSEARCH_NS}}}totalResults"
 
-    params = {
-        "search_query": f"all:{query}",
-        "start": 0,
-        "max_results": max_papers,
-        "sortBy": "submittedDate",
-        "sortOrder": "descending",
-    }
 
-    papers = []
-    for attempt in range(1, MAX_RETRIES + 1):
+def _window(days_back: int, start: str = None, end: str = None) -> tuple:
+    """Resolve the [start, end) fetch window; an explicit end replaces "now"."""
+    end_dt = datetime.fromisoformat(end) if end else datetime.now(timezone.utc)
+    start_dt = datetime.fromisoformat(start) if start else end_dt - timedelta(days=days_back)
+    if start_dt.tzinfo is None:
+        start_dt = start_dt.replace(tzinfo=timezone.utc)
+    if end_dt.tzinfo is None:
+        end_dt = end_dt.replace(tzinfo=timezone.utc)
+    return start_dt, end_dt
+
+
+def _entry_to_paper(entry) -> dict:
+    """One <entry> element → paper dict, in a single pass over its children."""
+    paper = {"title": "", "authors": [], "abstract": "", "arxiv_id": "", "published_at": "", "categories": []}
+    categories = {}
+    for child in entry:
+        tag = child.tag
+        if tag == _TITLE:
+            paper["title"] = (child.text or "").strip()
+        elif tag == _SUMMARY:
+            paper["abstract"] = (child.text or "").strip()
+        elif tag == _ID:
+            raw = child.text or ""
+            paper["arxiv_id"] = raw.split("/abs/")[-1] if "/abs/" in raw else raw
+        elif tag == _PUBLISHED:
+            paper["published_at"] = child.text or ""
+        elif tag == _AUTHOR:
+            if len(paper["authors"]) < 5:  # cap at 5
+                paper["authors"].append(child.findtext(_NAME, ""))
+        elif tag in (_PRIMARY_CATEGORY, _CATEGORY):
+            if child.get("term"):
+                categories[child.get("term")] = None  # ordered set, primary category first
+    paper["categories"] = list(categories)
+    return paper
+
+
+def iter_papers(source, cutoff_date: datetime, end_date: datetime, stats: dict = None):
+    """
+    Stream paper dicts inside [cutoff_date, end_date) out of an ArXiv Atom feed
+    (bytes or a binary file-like object) with iterparse. Each entry is dropped
+    from the tree once converted, so memory stays flat however many entries the
+    feed holds. If given, `stats` is filled with {"entries": entries seen,
+    "older": whether any entry predates cutoff_date, "total": opensearch:totalResults}.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    stats = {} if stats is None else stats
+    stats.update(entries=0, older=False, total=None)
+
+    root = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if root is None:
+            root = elem  # <feed>; processed entries are cleared out of it below
+            continue
+        if event != "end":
+            continue
+        if elem.tag == _TOTAL_RESULTS:
+            stats["total"] = int(elem.text) if (elem.text or "").strip().isdigit() else None
+        elif elem.tag == _ENTRY:
+            stats["entries"] += 1
+            paper = _entry_to_paper(elem)
+            root.clear()
+            try:
+                published_dt = datetime.fromisoformat(paper["published_at"].replace("Z", "+00:00"))
+            except ValueError:
+                continue
+            if published_dt < cutoff_date:
+                stats["older"] = True
+            elif published_dt < end_date:
+                yield paper
+
+
+def search_term(query: str) -> str:
+    """'cs.AI' → 'cat:cs.AI'; 'ti:diffusion' is passed through; anything else → 'all:<query>'."""
+    if CATEGORY_RE.match(query):
+        return f"cat:{query}"
+    if FIELD_PREFIX_RE.match(query):
+        return query
+    return f"all:{query}"
+
+
+async def _fetch_query(query: str, cutoff_date: datetime, end_date: datetime, max_papers: int,
+                       incremental: bool) -> list:
+    """Papers for one ArXiv query or category over [cutoff_date, end_date), newest first."""
+    fetch_from = corpus.delta_start("research", query, cutoff_date) if incremental else cutoff_date
+
+    # The window is always pushed down, so ArXiv only returns (nearly) in-window entries, newest
+    # first. Its bounds are widened to whole hours so reruns within the hour hit http_cache;
+    # iter_papers still drops entries outside the exact window.
+    from_hour = fetch_from.replace(minute=0, second=0, microsecond=0)
+    to_hour = end_date.replace(minute=0, second=0, microsecond=0)
+    if to_hour < end_date:
+        to_hour += timedelta(hours=1)
+    search_query = (
+        f"{search_term(query)} AND submittedDate:[{from_hour.strftime('%Y%m%d%H%M')}"
+        f" TO {to_hour.strftime('%Y%m%d%H%M')}]"
+    )
+    budget = max_papers
+    page_size = min(budget, PAGE_SIZE)
+
+    papers, complete = [], False
+    for page in range(MAX_PAGES):
+        params = {
+            "search_query": search_query,
+            "start": page * page_size,
+            "max_results": page_size,
+            "sortBy": "submittedDate",
+            "sortOrder": "descending",
+        }
+        # rate_limit.py spaces these requests by ArXiv's 3-second courtesy delay
         try:
-            response = requests.get(ARXIV_API_URL, params=params, timeout=20)
-            response.raise_for_status()
-
-            root = ET.fromstring(response.text)
-            entries = root.findall(f"{{{ARXIV_NS}}}entry")
-
-            for entry in entries:
-                published_str = entry.findtext(f"{{{ARXIV_NS}}}published", "")
-                try:
-                    published_dt = datetime.fromisoformat(published_str.replace("Z", "+00:00"))
-                except ValueError:
-                    continue
-
-                if published_dt < cutoff_date:
-                    continue
-
-                arxiv_id_raw = entry.findtext(f"{{{ARXIV_NS}}}id", "")
-                arxiv_id = arxiv_id_raw.split("/abs/")[-1] if "/abs/" in arxiv_id_raw else arxiv_id_raw
-
-                authors = [
-                    author.findtext(f"{{{ARXIV_NS}}}name", "")
-                    for author in entry.findall(f"{{{ARXIV_NS}}}author")
-                ]
-
-                categories = [
-                    tag.get("term", "")
-                    for tag in entry.findall("{http://arxiv.org/schemas/atom}primary_category")
-                ] + [
-                    tag.get("term", "")
-                    for tag in entry.findall("{http://www.w3.org/2005/Atom}category")
-                ]
-
-                papers.append({
-                    "title": entry.findtext(f"{{{ARXIV_NS}}}title", "").strip(),
-                    "authors": authors[:5],  # cap at 5
-                    "abstract": entry.findtext(f"{{{ARXIV_NS}}}summary", "").strip(),
-                    "arxiv_id": arxiv_id,
-                    "published_at": published_str,
-                    "categories": list(set(filter(None, categories))),
-                })
+            response = await http_client.aget(ARXIV_API_URL, params=params, timeout=20, attempts=MAX_RETRIES)
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"fetch_research failed after {MAX_RETRIES} retries: {e}") from e
+
+        stats = {}
+        papers.extend(iter_papers(response.content, fetch_from, end_date, stats))
+        if stats["older"] or stats["entries"] < page_size:
+            complete = True  # reached the cutoff or ran out of results
+            break
+        if stats["total"] is not None and (page + 1) * page_size >= stats["total"]:
+            complete = True
             break
+        if len(papers) >= budget:
+            break
+    papers = papers[:budget]
+
+    if incremental:
+        fetched = len(papers)
+        # Newest first, so a cut-off delta still covers [its oldest paper, end) without a gap
+        covered_from = fetch_from if complete else corpus.oldest_published(papers)
+        corpus.merge("research", query, papers, fetched_from=covered_from or fetch_from, fetched_to=end_date,
+                     complete=complete or covered_from is not None)
+        papers = corpus.window("research", cutoff_date, end_date, query=query, limit=max_papers)
+        logger.info(f"fetch_research: delta of {fetched} papers for '{query}' since {fetch_from.isoformat()}")
+    else:
+        corpus.add("research", query, papers)
+    return papers
+
+
+def merge_results(per_query: dict) -> list:
+    """
+    Merge {query: [papers]} into one list, deduplicated by version-stripped
+    arxiv_id. A later version replaces an earlier one in place, and each paper
+    lists every query/category that returned it under "queries". Queries are
+    interleaved rank by rank so a max_papers cut keeps every category's newest.
+    """
+    merged, by_id = [], {}
+    ranked = [[(query, paper) for paper in papers] for query, papers in per_query.items()]
+    for rank in range(max(map(len, ranked), default=0)):
+        for items in ranked:
+            if rank >= len(items):
+                continue
+            query, paper = items[rank]
+            base, version = corpus.split_arxiv_id(paper["arxiv_id"])
+            seen = by_id.get(base)
+            if seen is None:
+                by_id[base] = {**paper, "queries": [query]}
+                merged.append(by_id[base])
+                continue
+            if query not in seen["queries"]:
+                seen["queries"].append(query)
+            if version > corpus.split_arxiv_id(seen["arxiv_id"])[1]:
+                seen.update({k: v for k, v in paper.items() if k != "queries"})
+    return merged
 
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"Attempt {attempt}/{MAX_RETRIES} failed: {e}")
-            if attempt == MAX_RETRIES:
-                raise RuntimeError(f"fetch_research failed after {MAX_RETRIES} retries: {e}") from e
-            time.sleep(RETRY_DELAY)
+
+async def afetch_research(days_back: int = 7, query="artificial intelligence", max_papers: int = 30,
+                          start: str = None, end: str = None, incremental: bool = False,
+                          partial_ok: bool = False) -> dict:
+    cutoff_date, end_date = _window(days_back, start, end)
+    queries = [query] if isinstance(query, str) else list(dict.fromkeys(query))
+
+    # Queries run concurrently, but http_client lets one ArXiv request through at a
+    # time and rate_limit.py spaces them by the 3-second courtesy delay
+    outcomes = await asyncio.gather(
+        *(_fetch_query(q, cutoff_date, end_date, max_papers, incremental) for q in queries),
+        return_exceptions=True,
+    )
+    per_query = {q: r for q, r in zip(queries, outcomes) if not isinstance(r, BaseException)}
+    failed = {q: r for q, r in zip(queries, outcomes) if isinstance(r, BaseException)}
+
+    for q, e in failed.items():
+        logger.warning(f"fetch_research: query '{q}' failed: {e}")
+    if failed and not (partial_ok and per_query):
+        raise next(iter(failed.values()))
+
+    papers = merge_results(per_query)[:max_papers]
 
     result = {
         "papers": papers,
         "count": len(papers),
         "fetched_at": datetime.now(timezone.utc).isoformat(),
     }
+    if failed:
+        result["failed_queries"] = list(failed)
 
-    logger.info(f"fetch_research: retrieved {len(papers)} papers")
+    logger.info(f"fetch_research: retrieved {len(papers)} papers for {len(per_query)} queries")
     return result
 
 
+def fetch_research(days_back: int = 7, query="artificial intelligence", max_papers: int = 30,
+                   start: str = None, end: str = None, incremental: bool = False,
+                   partial_ok: bool = False) -> dict:
+    """Blocking wrapper around afetch_research()."""
+    return http_client.run(afetch_research(days_back, query, max_papers, start, end, incremental, partial_ok))
+
+
 if __name__ == "__main__":
     import sys
     payload = json.loads(sys.stdin.read()) if not sys.stdin.isatty() else {}
@@ -100,5 +280,9 @@ if __name__ == "__main__":
         days_back=payload.get("days_back", 7),
         query=payload.get("query", "artificial intelligence large language models deep learning"),
         max_papers=payload.get("max_papers", 30),
+        start=payload.get("start"),
+        end=payload.get("end"),
+        incremental=payload.get("incremental", False),
+        partial_ok=payload.get("partial_ok", False),
     )
     print(json.dumps(output, indent=2))
@@ -1,7 +1,8 @@
 """
 Tool: generate_charts.py
 Responsibility: Generate visualisation charts from trend analysis data.
-Input:  analyze_trends output dict
+Input:  analyze_trends output dict (optional "label" key tags the file names, e.g. per report profile;
+        optional "datestamp" (YYYYMMDD) replaces today's date, e.g. for backfilled weeks)
 Output: {"charts": {"keyword_bar": str, "theme_pie": str, "volume_trend": str}}
 """
 
@@ -15,6 +16,8 @@ matplotlib.use("Agg")  # Non-interactive backend — safe for servers
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 
+import telemetry
+
 logger = logging.getLogger(__name__)
 
 CHARTS_DIR = os.path.join(os.path.dirname(__file__), "..", "temp", "charts")
@@ -32,7 +35,13 @@ def _datestamp() -> str:
     return datetime.now().strftime("%Y%m%d")
 
 
-def generate_keyword_bar(top_keywords: list) -> str:
+def _chart_path(kind: str, label: str = "", datestamp: str = None) -> str:
+    datestamp = datestamp or _datestamp()
+    name = f"{kind}_{label}_{datestamp}.png" if label else f"{kind}_{datestamp}.png"
+    return os.path.join(CHARTS_DIR, name)
+
+
+def generate_keyword_bar(top_keywords: list, label: str = "", datestamp: str = None) -> str:
     _ensure_dir()
     keywords = [k["keyword"] for k in top_keywords[:10]]
     counts = [k["count"] for k in top_keywords[:10]]
@@ -55,14 +64,15 @@ def generate_keyword_bar(top_keywords: list) -> str:
                 str(count), va="center", color="white", fontsize=9)
 
     plt.tight_layout()
-    path = os.path.join(CHARTS_DIR, f"keyword_bar_{_datestamp()}.png")
+    path = _chart_path("keyword_bar", label, datestamp)
     fig.savefig(path, dpi=150, bbox_inches="tight", facecolor=BRAND_COLOR)
     plt.close(fig)
+    telemetry.artifact(path)
     logger.info(f"Saved keyword_bar chart: {path}")
     return path
 
 
-def generate_theme_pie(trending_themes: list, top_keywords: list) -> str:
+def generate_theme_pie(trending_themes: list, top_keywords: list, label: str = "", datestamp: str = None) -> str:
     _ensure_dir()
     themes = trending_themes[:6]
     if not themes:
@@ -99,14 +109,15 @@ def generate_theme_pie(trending_themes: list, top_keywords: list) -> str:
               ncol=2, frameon=False, labelcolor="white", fontsize=9)
 
     plt.tight_layout()
-    path = os.path.join(CHARTS_DIR, f"theme_pie_{_datestamp()}.png")
+    path = _chart_path("theme_pie", label, datestamp)
     fig.savefig(path, dpi=150, bbox_inches="tight", facecolor=BRAND_COLOR)
     plt.close(fig)
+    telemetry.artifact(path)
     logger.info(f"Saved theme_pie chart: {path}")
     return path
 
 
-def generate_volume_trend(article_count: int, paper_count: int) -> str:
+def generate_volume_trend(article_count: int, paper_count: int, label: str = "", datestamp: str = None) -> str:
     _ensure_dir()
     categories = ["News Articles", "Research Papers", "Total Sources"]
     values = [article_count, paper_count, article_count + paper_count]
@@ -132,23 +143,24 @@ def generate_volume_trend(article_count: int, paper_count: int) -> str:
     ax.spines["bottom"].set_color("#444")
 
     plt.tight_layout()
-    path = os.path.join(CHARTS_DIR, f"volume_trend_{_datestamp()}.png")
+    path = _chart_path("volume_trend", label, datestamp)
     fig.savefig(path, dpi=150, bbox_inches="tight", facecolor=BRAND_COLOR)
     plt.close(fig)
+    telemetry.artifact(path)
     logger.info(f"Saved volume_trend chart: {path}")
     return path
 
 
-def generate_charts(analysis: dict) -> dict:
+def generate_charts(analysis: dict, label: str = "", datestamp: str = None) -> dict:
     top_keywords = analysis.get("top_keywords", [])
     trending_themes = analysis.get("trending_themes", [])
     article_count = analysis.get("article_count", 0)
     paper_count = analysis.get("paper_count", 0)
 
     charts = {
-        "keyword_bar": generate_keyword_bar(top_keywords),
-        "theme_pie": generate_theme_pie(trending_themes, top_keywords),
-        "volume_trend": generate_volume_trend(article_count, paper_count),
+        "keyword_bar": generate_keyword_bar(top_keywords, label, datestamp),
+        "theme_pie": generate_theme_pie(trending_themes, top_keywords, label, datestamp),
+        "volume_trend": generate_volume_trend(article_count, paper_count, label, datestamp),
     }
 
     return {"charts": charts}
@@ -157,5 +169,5 @@ def generate_charts(analysis: dict) -> dict:
 if __name__ == "__main__":
     import sys
     payload = json.loads(sys.stdin.read()) if not sys.stdin.isatty() else {}
-    output = generate_charts(payload)
+    output = generate_charts(payload, label=payload.get("label", ""), datestamp=payload.get("datestamp"))
     print(json.dumps(output, indent=2))
@@ -1,7 +1,8 @@
 """
 Tool: generate_pdf.py
 Responsibility: Generate a branded PDF report from all collected data + charts.
-Input:  Combined dict with articles, papers, analysis, charts
+Input:  Combined dict with articles, papers, analysis, charts (optional "label" tags the file name;
+        optional "datestamp" (YYYYMMDD) dates the report, e.g. for backfilled weeks)
 Output: {"pdf_path": str, "page_count": int, "generated_at": str}
 """
 
@@ -20,6 +21,8 @@ from reportlab.platypus import (
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 
+import telemetry
+
 logger = logging.getLogger(__name__)
 
 REPORTS_DIR = os.path.join(os.path.dirname(__file__), "..", "temp", "reports")
@@ -66,7 +69,7 @@ def _header_footer(canvas, doc):
     canvas.setFont("Helvetica-Bold", 9)
     canvas.drawString(1 * cm, h - 0.8 * cm, "AI Research Intelligence Report")
     canvas.setFillColor(LIGHT_GRAY)
-    canvas.drawRightString(w - 1 * cm, h - 0.8 * cm, datetime.now().strftime("%B %d, %Y"))
+    canvas.drawRightString(w - 1 * cm, h - 0.8 * cm, doc.report_date)
 
     # Footer bar
     canvas.setFillColor(DARK_BG)
@@ -77,10 +80,13 @@ def _header_footer(canvas, doc):
     canvas.restoreState()
 
 
-def generate_pdf(articles: list, papers: list, analysis: dict, charts: dict) -> dict:
+def generate_pdf(articles: list, papers: list, analysis: dict, charts: dict, label: str = "",
+                 datestamp: str = None) -> dict:
     _ensure_dir()
-    datestamp = datetime.now().strftime("%Y%m%d")
-    pdf_path = os.path.join(REPORTS_DIR, f"AI_Report_{datestamp}.pdf")
+    report_dt = datetime.strptime(datestamp, "%Y%m%d") if datestamp else datetime.now()
+    datestamp = report_dt.strftime("%Y%m%d")
+    filename = f"AI_Report_{label}_{datestamp}.pdf" if label else f"AI_Report_{datestamp}.pdf"
+    pdf_path = os.path.join(REPORTS_DIR, filename)
 
     styles = _build_styles()
     w, h = A4
@@ -97,9 +103,10 @@ def generate_pdf(articles: list, papers: list, analysis: dict, charts: dict) ->
                   doc.width, doc.height, id="main")
     template = PageTemplate(id="main", frames=[frame], onPage=_header_footer)
     doc.addPageTemplates([template])
+    doc.report_date = report_dt.strftime("%B %d, %Y")  # read by _header_footer
 
     story = []
-    run_date = datetime.now().strftime("%B %d, %Y")
+    run_date = doc.report_date
 
     # ── Cover section ──────────────────────────────────────────────
     story.append(Spacer(1, 1.5 * cm))
@@ -119,6 +126,9 @@ def generate_pdf(articles: list, papers: list, analysis: dict, charts: dict) ->
         f"The most active source was <b>{stats.get('most_active_source', 'N/A')}</b>. "
         f"Top trending themes: <b>{top_themes}</b>."
     )
+    emerging = ", ".join(k["keyword"] for k in analysis.get("emerging", [])[:5])
+    if emerging:
+        summary_text += f" Rising fastest against recent weeks: <b>{emerging}</b>."
     story.append(Paragraph(summary_text, styles["body"]))
     story.append(Spacer(1, 0.4 * cm))
 
@@ -193,6 +203,7 @@ def generate_pdf(articles: list, papers: list, analysis: dict, charts: dict) ->
         story.append(Spacer(1, 0.3 * cm))
 
     doc.build(story)
+    telemetry.artifact(pdf_path)
 
     page_count = doc.page
     result = {
@@ -213,5 +224,7 @@ if __name__ == "__main__":
         papers=payload.get("papers", []),
         analysis=payload.get("analysis", {}),
         charts=payload.get("charts", {}),
+        label=payload.get("label", ""),
+        datestamp=payload.get("datestamp"),
     )
     print(json.dumps(output, indent=2))
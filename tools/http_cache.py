@@ -0,0 +1,117 @@
+"""
+Module: http_cache.py
+Responsibility: Persistent, gzip-compressed cache of upstream GET responses.
+    Entries live under temp/cache/<host>/ and are keyed by the normalized URL
+    plus sorted query params, with credentials (apiKey etc.) stripped so keys
+    never hold secrets and rotating a key does not invalidate the cache. Each
+    host has its own TTL; stale entries that carried an ETag or Last-Modified
+    header are revalidated with a conditional request instead of refetched.
+    Set HTTP_CACHE=0 to bypass the cache entirely.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlencode, urlparse
+
+import requests
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "temp", "cache")
+ENABLED = os.environ.get("HTTP_CACHE", "1") != "0"
+
+# Seconds a response stays fresh, per host. Hosts not listed are never cached.
+HOST_TTLS = {
+    "newsapi.org": 60 * 60,
+    "export.arxiv.org": 6 * 60 * 60,
+}
+
+SECRET_PARAMS = {"apikey", "api_key", "key", "token", "access_token"}
+VALIDATOR_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+
+def ttl_for(url: str) -> int:
+    return HOST_TTLS.get(urlparse(url).hostname or "", 0) if ENABLED else 0
+
+
+def cache_key(url: str, params: dict = None) -> str:
+    parsed = urlparse(url)
+    normalized = f"{parsed.scheme.lower()}://{(parsed.hostname or '').lower()}{parsed.path.rstrip('/') or '/'}"
+    kept = sorted(
+        (k, str(v)) for k, v in (params or {}).items()
+        if k.lower() not in SECRET_PARAMS and v is not None
+    )
+    return hashlib.sha256(f"{normalized}?{urlencode(kept)}".encode()).hexdigest()
+
+
+def _path(url: str, key: str) -> str:
+    return os.path.join(CACHE_DIR, urlparse(url).hostname or "_", f"{key}.json.gz")
+
+
+class CacheEntry:
+    def __init__(self, path: str, data: dict, ttl: int):
+        self.path = path
+        self.data = data
+        self.ttl = ttl
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.data["stored_at"] < self.ttl
+
+    def validators(self) -> dict:
+        """Conditional-request headers for revalidating this entry."""
+        headers = {}
+        if self.data["headers"].get("ETag"):
+            headers["If-None-Match"] = self.data["headers"]["ETag"]
+        if self.data["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = self.data["headers"]["Last-Modified"]
+        return headers
+
+    def touch(self):
+        """Mark the entry fresh again after a 304 Not Modified."""
+        self.data["stored_at"] = time.time()
+        _write(self.path, self.data)
+
+    def response(self) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.data["status"]
+        response.headers.update(self.data["headers"])
+        response._content = self.data["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = self.data["url"]
+        return response
+
+
+def _write(path: str, data: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def lookup(url: str, params: dict = None):
+    """The cached entry for this request (fresh or stale), or None if uncached/uncacheable."""
+    ttl = ttl_for(url)
+    if ttl <= 0:
+        return None
+    path = _path(url, cache_key(url, params))
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return CacheEntry(path, json.load(f), ttl)
+    except (OSError, ValueError, EOFError):
+        return None
+
+
+def store(url: str, params: dict, response: requests.Response):
+    ttl = ttl_for(url)
+    if ttl <= 0 or response.status_code != 200:
+        return
+    _write(_path(url, cache_key(url, params)), {
+        "url": url,
+        "stored_at": time.time(),
+        "status": response.status_code,
+        "headers": {h: response.headers[h] for h in VALIDATOR_HEADERS if h in response.headers},
+        "body": response.text,
+    })
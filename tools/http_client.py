@@ -0,0 +1,198 @@
+"""
+Module: http_client.py
+Responsibility: One shared HTTP client for every upstream call.
+    Keeps a pooled keep-alive httpx.AsyncClient per event loop, paces each host
+    via rate_limit.py, and retries transient failures (connection errors, timeouts,
+    5xx, 429) with exponential backoff plus full jitter. A Retry-After header
+    overrides the computed delay, and exhausted rate limiting surfaces as a
+    typed RateLimitError. Each request's latency and the time spent waiting on
+    rate_limit.py are reported through telemetry.
+    Responses from cacheable hosts are served from / stored in http_cache.py.
+    aget() bounds the requests in flight per host; run() drives an async fetch
+    from synchronous code.
+"""
+
+import asyncio
+import logging
+import random
+import time
+import weakref
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import httpx
+import requests
+
+import http_cache
+import rate_limit
+import telemetry
+
+logger = logging.getLogger(__name__)
+
+POOL_CONNECTIONS = 10   # distinct hosts kept alive
+POOL_MAXSIZE = 20       # concurrent connections per host
+BACKOFF_BASE = 1.0      # seconds; attempt n waits up to BACKOFF_BASE * 2**(n-1)
+BACKOFF_MAX = 60.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Requests in flight at once per host from one event loop
+HOST_CONCURRENCY = {
+    "newsapi.org": 6,
+    "export.arxiv.org": 1,
+}
+DEFAULT_HOST_CONCURRENCY = 4
+
+_loop_states = weakref.WeakKeyDictionary()  # event loop → {"client", "semaphores"}
+
+
+class RateLimitError(requests.exceptions.HTTPError):
+    """The upstream API kept answering 429 after every retry."""
+
+    def __init__(self, message: str, retry_after: float = None, response=None):
+        super().__init__(message, response=response)
+        self.retry_after = retry_after
+
+
+def _retry_after(response) -> float:
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP-date), else None."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given (1-based) failed attempt."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+def _from_cache(url: str, params: dict, kwargs: dict):
+    """(cache entry, response to return right away or None); adds revalidation headers to `kwargs`."""
+    cached = http_cache.lookup(url, params)
+    if cached is not None and cached.fresh:
+        telemetry.count("cache_hits")
+        telemetry.emit("cache_hit", url=url)
+        return cached, cached.response()
+    if cached is not None:
+        kwargs["headers"] = {**kwargs.get("headers", {}), **cached.validators()}
+    return cached, None
+
+
+def _record(url: str, response, sent_at: float, attempt: int):
+    latency_ms = round((time.perf_counter() - sent_at) * 1000, 1)
+    telemetry.count("http_latency_ms", latency_ms)
+    telemetry.emit("http_request", url=url, status=response.status_code if response is not None else None,
+                   latency_ms=latency_ms, attempt=attempt)
+
+
+def _outcome(url: str, params: dict, response, cached) -> tuple:
+    """
+    (response to return, None) on success or 304, (None, retryable error)
+    for 429/5xx. Raises HTTPError for any other 4xx — those are not worth retrying.
+    """
+    if response.status_code == 304 and cached is not None:
+        cached.touch()
+        telemetry.count("cache_revalidated")
+        return cached.response(), None
+    if response.status_code == 429:
+        telemetry.count("http_rate_limited")
+        return None, RateLimitError(f"{url} rate limited (HTTP 429)", _retry_after(response), response)
+    if response.status_code in RETRY_STATUSES:
+        return None, requests.exceptions.HTTPError(f"{url} returned HTTP {response.status_code}", response=response)
+    if response.status_code >= 400:
+        raise requests.exceptions.HTTPError(f"{url} returned HTTP {response.status_code}", response=response)
+    if http_cache.ttl_for(url) > 0:
+        telemetry.count("cache_misses")
+        http_cache.store(url, params, response)
+    return response, None
+
+
+def _retry_delay(url: str, attempt: int, attempts: int, error: Exception, response) -> float:
+    """Seconds to wait before the next attempt; re-raises `error` when retrying is pointless."""
+    if attempt == attempts:
+        raise error
+    delay = _retry_after(response)
+    if delay is None:
+        delay = backoff_delay(attempt)
+    elif delay > BACKOFF_MAX:
+        raise error  # e.g. a daily quota reset hours away — waiting would stall the run
+    logger.warning(f"Attempt {attempt}/{attempts} for {url} failed: {error} — retrying in {delay:.1f}s")
+    telemetry.count("http_retries")
+    telemetry.emit("retry", url=url, attempt=attempt, error=str(error), delay_s=round(delay, 2))
+    return delay
+
+
+def _async_state() -> dict:
+    """The running event loop's httpx client and per-host semaphores (created on first use)."""
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        limits = httpx.Limits(max_connections=POOL_MAXSIZE, max_keepalive_connections=POOL_CONNECTIONS)
+        state = _loop_states[loop] = {"client": httpx.AsyncClient(limits=limits), "semaphores": {}}
+    return state
+
+
+def _host_semaphore(state: dict, url: str) -> asyncio.Semaphore:
+    host = urlparse(url).hostname or ""
+    if host not in state["semaphores"]:
+        state["semaphores"][host] = asyncio.Semaphore(HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY))
+    return state["semaphores"][host]
+
+
+async def aget(url: str, params: dict = None, timeout: float = 15, attempts: int = 3, **kwargs):
+    """
+    GET `url` with at most HOST_CONCURRENCY requests per host in flight on
+    this event loop. Returns the successful (or cached) response; raises
+    RateLimitError if still rate limited after `attempts` tries, the HTTPError
+    for a non-retryable status, or the last connection error. Transport
+    failures surface as requests' ConnectionError/Timeout.
+    """
+    cached, hit = _from_cache(url, params, kwargs)
+    if hit is not None:
+        return hit
+    state = _async_state()
+    semaphore = _host_semaphore(state, url)
+
+    for attempt in range(1, attempts + 1):
+        wait = rate_limit.reserve(url)
+        telemetry.count("rate_limit_wait_s", wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        telemetry.count("http_requests")
+        response, error = None, None
+        async with semaphore:
+            sent_at = time.perf_counter()
+            try:
+                response = await state["client"].get(url, params=params, timeout=timeout, **kwargs)
+            except httpx.TimeoutException as e:
+                error = requests.exceptions.Timeout(str(e))
+            except httpx.TransportError as e:
+                error = requests.exceptions.ConnectionError(str(e))
+        _record(url, response, sent_at, attempt)
+        if response is not None:
+            result, error = _outcome(url, params, response, cached)
+            if result is not None:
+                return result
+        await asyncio.sleep(_retry_delay(url, attempt, attempts, error, response))
+
+
+async def _closing(coro):
+    try:
+        return await coro
+    finally:
+        state = _loop_states.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state["client"].aclose()
+
+
+def run(coro):
+    """Run an async fetch to completion from synchronous code, closing its connections afterwards."""
+    return asyncio.run(_closing(coro))
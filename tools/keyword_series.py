@@ -0,0 +1,169 @@
+"""
+Module: keyword_series.py
+Responsibility: Weekly keyword counts over time, for emerging / fading term detection.
+    Every term gets a stable integer id in the `terms` table; each week is one
+    row of `weeks` holding two parallel uint32 columns (the ids of the terms
+    seen that week and their counts, zlib-compressed) plus the week's total
+    keyword count. A week costs only the terms it contains, so years of
+    history over a vocabulary of hundreds of thousands of terms stay small,
+    and reading the last N weeks is N row loads scattered into one
+    (weeks x vocabulary) matrix.
+
+    trends() compares a week against that history in one vectorized pass over
+    every term: count delta against the previous week, growth of the term's
+    share of the week, and a z-score of that share against its mean and spread
+    over the history window. The highest z-scores are "emerging", the lowest
+    "fading".
+"""
+
+import logging
+import os
+import sqlite3
+import zlib
+
+import numpy as np
+
+import corpus
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.path.join(corpus.CORPUS_DIR, "keyword_series.sqlite")
+HISTORY_WEEKS = 12  # weeks a term's current share is compared against
+MIN_WEEKS = 2       # history needed before anything is called emerging or fading
+MIN_COUNT = 3       # occurrences (this week for emerging, on average for fading)
+Z_THRESHOLD = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS weeks (
+    period TEXT PRIMARY KEY,  -- ISO week, e.g. 2026-W11; sorts chronologically
+    total INTEGER NOT NULL,
+    ids BLOB NOT NULL,        -- zlib(uint32[]), ascending term ids
+    counts BLOB NOT NULL      -- zlib(uint32[]), parallel to ids
+);
+"""
+
+
+def _connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _pack(values: np.ndarray) -> bytes:
+    return zlib.compress(values.astype(np.uint32).tobytes())
+
+
+def _unpack(blob: bytes) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(blob), dtype=np.uint32)
+
+
+def _term_ids(conn: sqlite3.Connection, terms, create: bool = False) -> dict:
+    """{term: id} for the given terms, assigning ids to new ones when `create`."""
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS lookup (term TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM lookup")
+    conn.executemany("INSERT OR IGNORE INTO lookup (term) VALUES (?)", ((t,) for t in terms))
+    if create:
+        conn.execute("INSERT OR IGNORE INTO terms (term) SELECT term FROM lookup")
+    return dict(conn.execute("SELECT terms.term, terms.id FROM lookup JOIN terms ON terms.term = lookup.term"))
+
+
+def append(period: str, counts: dict) -> None:
+    """Store one week's {term: count}, replacing that week if it was stored before."""
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            ids = _term_ids(conn, counts, create=True)
+            id_array = np.fromiter((ids[t] for t in counts), dtype=np.uint32, count=len(counts))
+            count_array = np.fromiter(counts.values(), dtype=np.uint32, count=len(counts))
+            order = np.argsort(id_array)
+            conn.execute(
+                "INSERT OR REPLACE INTO weeks (period, total, ids, counts) VALUES (?, ?, ?, ?)",
+                (period, int(count_array.sum()), _pack(id_array[order]), _pack(count_array[order])),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+    logger.info(f"keyword_series: stored {period} ({len(counts)} terms)")
+
+
+def _entries(idx: np.ndarray, names: dict, counts: np.ndarray, delta: np.ndarray,
+             growth: np.ndarray, z: np.ndarray) -> list:
+    return [
+        {"keyword": names[i], "count": int(counts[i]), "delta": int(delta[i]),
+         "growth": round(float(growth[i]), 2), "z": round(float(z[i]), 2)}
+        for i in idx
+    ]
+
+
+def trends(period: str, counts: dict, top_n: int = 10, weeks: int = HISTORY_WEEKS) -> dict:
+    """
+    {"emerging": [...], "fading": [...]} for a week's {term: count} against
+    the `weeks` stored weeks before `period`. Each entry carries the term's
+    count, delta against the previous week, growth of its share of the week
+    (0.5 = +50%) and z-score. Both lists are empty until MIN_WEEKS of history exist.
+    """
+    empty = {"emerging": [], "fading": []}
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT total, ids, counts FROM weeks WHERE period < ? ORDER BY period DESC LIMIT ?", (period, weeks)
+        ).fetchall()
+        if len(rows) < MIN_WEEKS or not counts:
+            return empty
+        ids = _term_ids(conn, counts)
+        names = {i: t for t, i in ids.items()}
+        # Terms never stored get ids past the vocabulary; their history is all zeros
+        width = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM terms").fetchone()[0]
+        for term in counts:
+            if term not in ids:
+                ids[term], names[width] = width, term
+                width += 1
+
+        history = np.zeros((len(rows), width), dtype=np.float64)  # shares, newest week first
+        totals = np.empty(len(rows), dtype=np.float64)
+        for k, (total, id_blob, count_blob) in enumerate(rows):
+            totals[k] = total or 1
+            history[k, _unpack(id_blob)] = _unpack(count_blob) / totals[k]
+
+        current = np.zeros(width, dtype=np.float64)
+        current_ids = np.fromiter((ids[t] for t in counts), dtype=np.int64, count=len(counts))
+        current[current_ids] = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        total = current.sum() or 1
+        share = current / total
+
+        previous = history[0]
+        mean = history.mean(axis=0)
+        # Floor the spread at one occurrence in an average week so a term that
+        # was flat (often flat at zero) needs a real jump to register.
+        floor = 1 / totals.mean()
+        z = (share - mean) / np.maximum(history.std(axis=0), floor)
+        growth = (share - previous) / np.maximum(previous, floor)
+        delta = current - np.rint(previous * totals[0])
+
+        emerging = np.flatnonzero((current >= MIN_COUNT) & (z >= Z_THRESHOLD))
+        emerging = emerging[np.argsort(-z[emerging], kind="stable")][:top_n]
+        fading = np.flatnonzero((mean * total >= MIN_COUNT) & (z <= -Z_THRESHOLD))
+        fading = fading[np.argsort(z[fading], kind="stable")][:top_n]
+
+        missing = [int(i) for i in fading if i not in names]
+        if missing:
+            sql = f"SELECT id, term FROM terms WHERE id IN ({', '.join('?' * len(missing))})"
+            names.update(conn.execute(sql, missing))
+    finally:
+        conn.close()
+
+    return {
+        "emerging": _entries(emerging, names, current, delta, growth, z),
+        "fading": _entries(fading, names, current, delta, growth, z),
+    }
@@ -0,0 +1,118 @@
+"""
+Module: rate_limit.py
+Responsibility: Enforce per-host request policies across threads *and* processes.
+    Each host has a token bucket (sustained requests per second plus a burst
+    allowance) and an optional per-day quota, both kept in a small SQLite file
+    so parallel runs (e.g. the backfill process pool) share one budget.
+    acquire(url) takes a token and sleeps until it is due; async callers use
+    reserve() and await the returned delay themselves. A request that would
+    exceed the host's daily quota raises QuotaExceeded instead of waiting for
+    the next UTC day.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+STATE_PATH = os.path.join(os.path.dirname(__file__), "..", "temp", "state", "rate_limit.sqlite")
+
+# per_second: sustained rate; burst: tokens that may be spent back to back; per_day: quota (None = unlimited).
+# NewsAPI's developer plan allows 100 requests/day; ArXiv asks clients to wait ~3s between requests.
+HOST_POLICIES = {
+    "newsapi.org": {"per_second": 1.0, "burst": 1, "per_day": 100},
+    "export.arxiv.org": {"per_second": 1 / 3, "burst": 1, "per_day": None},
+}
+DEFAULT_POLICY = None  # hosts without a policy are not limited
+
+
+class QuotaExceeded(RuntimeError):
+    """The host's daily request quota is used up until `resets_at`."""
+
+    def __init__(self, host: str, per_day: int, resets_at: datetime):
+        super().__init__(f"{host} daily quota of {per_day} requests used up (resets {resets_at.isoformat()})")
+        self.host = host
+        self.resets_at = resets_at
+
+
+def _connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    conn = sqlite3.connect(STATE_PATH, timeout=30, isolation_level=None)
+    conn.execute("CREATE TABLE IF NOT EXISTS buckets (host TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+                 "updated_at REAL NOT NULL)")
+    conn.execute("CREATE TABLE IF NOT EXISTS daily (host TEXT NOT NULL, day TEXT NOT NULL, "
+                 "requests INTEGER NOT NULL, PRIMARY KEY (host, day))")
+    return conn
+
+
+def reserve(url: str) -> float:
+    """
+    Take a token for `url`'s host and return the seconds until it may be used
+    (no sleeping). Tokens can go negative: each caller queues behind the ones
+    already reserved, so concurrent callers are spaced 1/per_second apart.
+    """
+    host = urlparse(url).hostname or url
+    policy = HOST_POLICIES.get(host, DEFAULT_POLICY)
+    if not policy:
+        return 0.0
+
+    rate, burst, per_day = policy["per_second"], policy["burst"], policy.get("per_day")
+    conn = _connect()
+    try:
+        # BEGIN IMMEDIATE takes the write lock up front, so two processes can
+        # never read the same bucket state and both spend the same token.
+        conn.execute("BEGIN IMMEDIATE")
+        now = time.time()
+        today = datetime.now(timezone.utc).date()
+        if per_day is not None:
+            row = conn.execute("SELECT requests FROM daily WHERE host = ? AND day = ?",
+                               (host, today.isoformat())).fetchone()
+            if row and row[0] >= per_day:
+                conn.execute("ROLLBACK")
+                resets_at = datetime.combine(today + timedelta(days=1), datetime.min.time(), timezone.utc)
+                raise QuotaExceeded(host, per_day, resets_at)
+            conn.execute(
+                "INSERT INTO daily (host, day, requests) VALUES (?, ?, 1) "
+                "ON CONFLICT(host, day) DO UPDATE SET requests = requests + 1",
+                (host, today.isoformat()),
+            )
+
+        row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE host = ?", (host,)).fetchone()
+        tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+        tokens -= 1
+        conn.execute(
+            "INSERT INTO buckets (host, tokens, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(host) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+            (host, tokens, now),
+        )
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+    wait = -tokens / rate if tokens < 0 else 0.0
+    if wait > 0:
+        logger.debug(f"rate_limit: waiting {wait:.2f}s for {host}")
+    return wait
+
+
+def acquire(url: str) -> float:
+    """Block until this process may call `url`'s host. Returns the seconds spent waiting."""
+    wait = reserve(url)
+    if wait > 0:
+        time.sleep(wait)
+    return wait
+
+
+def usage(host: str) -> int:
+    """Requests made to `host` so far today (UTC), across all processes."""
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT requests FROM daily WHERE host = ? AND day = ?",
+                           (host, datetime.now(timezone.utc).date().isoformat())).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else 0
@@ -2,7 +2,8 @@
 Tool: send_email.py
 Responsibility: Send the weekly AI report email with PDF attached.
 Input:  {"pdf_path": str, "run_date": str, "article_count": int,
-          "paper_count": int, "top_keywords": [...], "sheet_url": str}
+          "paper_count": int, "top_keywords": [...], "sheet_url": str,
+          "recipients": [...] (optional, defaults to EMAIL_RECIPIENTS)}
 Output: {"sent": bool, "recipients": [...], "sent_at": str}
 """
 
@@ -29,6 +30,10 @@ EMAIL_RECIPIENTS = [
     for r in os.environ.get("EMAIL_RECIPIENTS", "").split(",")
     if r.strip()
 ]
+# Overridable, e.g. to point at the local SMTP sink in tools/standin.py
+SMTP_HOST = os.environ.get("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", "465"))
+SMTP_SSL = os.environ.get("SMTP_SSL", "1") != "0"
 MAX_RETRIES = 2
 
 
@@ -69,13 +74,16 @@ def send_email(
     top_keywords: list,
     sheet_url: str = "",
     failure_mode: bool = False,
+    recipients: list = None,
 ) -> dict:
     import smtplib
 
+    recipients = recipients or EMAIL_RECIPIENTS
+
     if not GMAIL_USER or not GMAIL_APP_PASSWORD:
         raise EnvironmentError("GMAIL_USER or GMAIL_APP_PASSWORD not set in environment.")
 
-    if not EMAIL_RECIPIENTS:
+    if not recipients:
         raise EnvironmentError("EMAIL_RECIPIENTS not set in environment.")
 
     subject = (
@@ -86,7 +94,7 @@ def send_email(
 
     msg = MIMEMultipart("alternative")
     msg["From"] = GMAIL_USER
-    msg["To"] = ", ".join(EMAIL_RECIPIENTS)
+    msg["To"] = ", ".join(recipients)
     msg["Subject"] = subject
 
     html_body = _build_html_body(run_date, article_count, paper_count, top_keywords, sheet_url)
@@ -107,14 +115,15 @@ def send_email(
     last_error = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465, timeout=15) as server:
+            smtp_class = smtplib.SMTP_SSL if SMTP_SSL else smtplib.SMTP
+            with smtp_class(SMTP_HOST, SMTP_PORT, timeout=15) as server:
                 server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
-                server.sendmail(GMAIL_USER, EMAIL_RECIPIENTS, msg.as_string())
+                server.sendmail(GMAIL_USER, recipients, msg.as_string())
             sent_at = datetime.now(timezone.utc).isoformat()
-            logger.info(f"send_email: delivered to {EMAIL_RECIPIENTS}")
+            logger.info(f"send_email: delivered to {recipients}")
             return {
                 "sent": True,
-                "recipients": EMAIL_RECIPIENTS,
+                "recipients": recipients,
                 "sent_at": sent_at,
             }
         except Exception as e:
@@ -126,7 +135,7 @@ def send_email(
     logger.error(f"send_email failed after {MAX_RETRIES} attempts: {last_error}")
     return {
         "sent": False,
-        "recipients": EMAIL_RECIPIENTS,
+        "recipients": recipients,
         "sent_at": "",
         "error": str(last_error),
     }
@@ -142,5 +151,6 @@ if __name__ == "__main__":
         paper_count=payload.get("paper_count", 0),
         top_keywords=payload.get("top_keywords", []),
         sheet_url=payload.get("sheet_url", ""),
+        recipients=payload.get("recipients"),
     )
     print(json.dumps(output, indent=2))
@@ -0,0 +1,411 @@
+"""
+Module: standin.py
+Responsibility: Local stand-ins for every external service, so the pipeline can
+    run (and be benchmarked) offline. One HTTP server answers NewsAPI
+    (/v2/everything), ArXiv (/api/query) and the Sheets v4 spreadsheet/values
+    endpoints; an SMTP sink accepts the report email. NewsAPI and ArXiv
+    responses are replayed from a cassette recorded once against the live APIs
+    (--record proxies each request upstream and saves the answer), with their
+    timestamps shifted so the data looks as fresh as when it was recorded.
+    Sheets is simulated in memory and delivered mail lands in temp/standin/outbox/.
+    The corpus, its high-water marks and the keyword history are kept apart in
+    temp/standin/corpus/ (CORPUS_DIR), so replayed data never reaches a live run.
+    Latency and error injection apply to every request and every message.
+
+Usage:
+    python tools/standin.py --record -- python main.py    # record once (needs NEWS_API_KEY)
+    python tools/standin.py -- python main.py             # replay, fully offline
+    python tools/standin.py --latency-ms 200 --error-rate 0.2 -- python main.py
+    python tools/standin.py                               # just serve; prints the env to export
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import socketserver
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlencode, urlparse
+
+logger = logging.getLogger(__name__)
+
+STANDIN_DIR = os.path.join(os.path.dirname(__file__), "..", "temp", "standin")
+CASSETTE_PATH = os.path.join(STANDIN_DIR, "cassette.json")
+
+UPSTREAMS = {
+    "news": "https://newsapi.org/v2/everything",
+    "arxiv": "http://export.arxiv.org/api/query",
+}
+ROUTES = {"/v2/everything": "news", "/api/query": "arxiv"}
+
+# Params that change on every run (credentials, the sliding window) are not part of a cassette key
+VOLATILE_PARAMS = {"apikey", "from", "to"}
+SUBMITTED_DATE = re.compile(r"\s+AND submittedDate:\[[^\]]*\]")
+
+EMPTY = {
+    "news": ("application/json", json.dumps({"status": "ok", "totalResults": 0, "articles": []})),
+    "arxiv": ("application/atom+xml", '<feed xmlns="http://www.w3.org/2005/Atom"></feed>'),
+}
+
+
+def cassette_key(service: str, params: dict) -> str:
+    kept = sorted(
+        (k, SUBMITTED_DATE.sub("", v)) for k, v in params.items() if k.lower() not in VOLATILE_PARAMS
+    )
+    return f"{service}?{urlencode(kept)}"
+
+
+def _shift_timestamps(service: str, body: str, delta) -> str:
+    """Move every publication timestamp in a recorded body forward by `delta`."""
+    def shift(value: str) -> str:
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+        return (dt + delta).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    if service == "news":
+        data = json.loads(body)
+        for article in data.get("articles", []):
+            if article.get("publishedAt"):
+                article["publishedAt"] = shift(article["publishedAt"])
+        return json.dumps(data)
+    return re.sub(r"<(published|updated)>([^<]+)</\1>", lambda m: f"<{m[1]}>{shift(m[2])}</{m[1]}>", body)
+
+
+class Faults:
+    """Latency and error injection shared by the HTTP and SMTP stand-ins."""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 error_status: int = 503, seed: int = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        with self._lock:
+            ms = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if ms > 0:
+            time.sleep(ms / 1000)
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+
+class Cassette:
+    def __init__(self, path: str, record: bool):
+        self.path = path
+        self.record = record
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)["entries"]
+        except (OSError, ValueError, KeyError):
+            self.entries = {}
+
+    def lookup(self, service: str, params: dict):
+        entry = self.entries.get(cassette_key(service, params))
+        if entry is None:
+            return None
+        delta = datetime.now(timezone.utc) - datetime.fromisoformat(entry["recorded_at"])
+        return entry["content_type"], _shift_timestamps(service, entry["body"], delta)
+
+    def fetch_and_store(self, service: str, params: dict):
+        import requests
+
+        import rate_limit
+
+        upstream = UPSTREAMS[service]
+        rate_limit.acquire(upstream)  # recording still has to respect the real API's limits
+        response = requests.get(upstream, params=params, timeout=30)
+        content_type = response.headers.get("Content-Type", EMPTY[service][0])
+        if response.status_code == 200:
+            with self._lock:
+                self.entries[cassette_key(service, params)] = {
+                    "recorded_at": datetime.now(timezone.utc).isoformat(),
+                    "content_type": content_type,
+                    "body": response.text,
+                }
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp = f"{self.path}.tmp"
+                with open(tmp, "w") as f:
+                    json.dump({"entries": self.entries}, f)
+                os.replace(tmp, self.path)
+        return response.status_code, content_type, response.text
+
+
+# ── Sheets v4 (in memory) ─────────────────────────────────────────────────────
+
+def _a1_rows(a1_range: str) -> tuple:
+    """'Run Log!A1:H1' → ('Run Log', 1, 1); a range without row numbers spans the whole sheet."""
+    sheet, _, cells = a1_range.partition("!")
+    rows = [int(n) for n in re.findall(r"[A-Z]+(\d+)", cells)]
+    return sheet, (rows[0] if rows else 1), (rows[-1] if rows else None)
+
+
+class Sheets:
+    def __init__(self, path: str):
+        self.path = path
+        self.spreadsheets = {}
+        self._lock = threading.Lock()
+
+    def _sheet(self, spreadsheet_id: str) -> dict:
+        return self.spreadsheets.setdefault(spreadsheet_id, {})
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(self.spreadsheets, f, indent=2)
+
+    def handle(self, method: str, path: str, body: dict) -> tuple:
+        match = re.match(r"^/v4/spreadsheets/([^/:]+)(?::(batchUpdate))?(?:/values/([^:]+)(?::(append))?)?$", path)
+        if not match:
+            return 404, {"error": {"code": 404, "message": f"Unknown Sheets path {path}"}}
+        spreadsheet_id, batch_update, a1_range, append = match.groups()
+        with self._lock:
+            tabs = self._sheet(spreadsheet_id)
+            if a1_range is None and batch_update is None:
+                return 200, {"spreadsheetId": spreadsheet_id,
+                             "sheets": [{"properties": {"title": title}} for title in tabs]}
+            if batch_update:
+                for request in body.get("requests", []):
+                    title = request.get("addSheet", {}).get("properties", {}).get("title")
+                    if title:
+                        tabs.setdefault(title, [])
+                self._save()
+                return 200, {"spreadsheetId": spreadsheet_id, "replies": [{} for _ in body.get("requests", [])]}
+
+            sheet, first, last = _a1_rows(unquote(a1_range))
+            rows = tabs.setdefault(sheet, [])
+            values = body.get("values", [])
+            if method == "GET":
+                return 200, {"range": unquote(a1_range), "values": rows[first - 1:last]}
+            if append:
+                rows.extend(values)
+            else:
+                rows[first - 1:first - 1 + len(values)] = values
+            self._save()
+            updates = {"spreadsheetId": spreadsheet_id, "updatedRange": unquote(a1_range), "updatedRows": len(values)}
+            return 200, {"updates": updates} if append else updates
+
+
+# ── HTTP stand-in ─────────────────────────────────────────────────────────────
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "standin/1.0"
+
+    def log_message(self, fmt, *args):
+        logger.debug(f"standin http: {fmt % args}")
+
+    def _send(self, status: int, content_type: str, body: str, headers: dict = None):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self):
+        standin = self.server.standin
+        standin.faults.delay()
+        if standin.faults.should_fail():
+            status = standin.faults.error_status
+            headers = {"Retry-After": "1"} if status == 429 else None
+            return self._send(status, "application/json", json.dumps({"status": "error", "code": "injected"}),
+                              headers)
+
+        url = urlparse(self.path)
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        if url.path.startswith("/v4/spreadsheets/"):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            status, data = standin.sheets.handle(self.command, url.path, body)
+            return self._send(status, "application/json", json.dumps(data))
+
+        service = ROUTES.get(url.path)
+        if service is None:
+            return self._send(404, "text/plain", f"standin: no route for {url.path}")
+        if standin.cassette.record:
+            status, content_type, body = standin.cassette.fetch_and_store(service, params)
+            return self._send(status, content_type, body)
+        replay = standin.cassette.lookup(service, params)
+        if replay is None:
+            logger.warning(f"standin: no recording for {cassette_key(service, params)} — serving an empty result")
+            replay = EMPTY[service]
+        self._send(200, *replay)
+
+    do_GET = do_POST = do_PUT = _handle
+
+
+# ── SMTP sink ─────────────────────────────────────────────────────────────────
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP (EHLO, AUTH PLAIN/LOGIN, MAIL, RCPT, DATA) for smtplib."""
+
+    def _reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        standin = self.server.standin
+        self._reply("220 standin ESMTP")
+        sender, recipients = None, []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode(errors="replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self.wfile.write(b"250-standin\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+            elif verb == "AUTH":
+                if command.upper().startswith("AUTH LOGIN"):
+                    self._reply("334 VXNlcm5hbWU6")
+                    self.rfile.readline()
+                    self._reply("334 UGFzc3dvcmQ6")
+                    self.rfile.readline()
+                self._reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                sender, recipients = command.split(":", 1)[1].strip(), []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command.split(":", 1)[1].strip())
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(line[1:] if line.startswith(b"..") else line)
+                standin.faults.delay()
+                if standin.faults.should_fail():
+                    self._reply("451 4.3.0 Injected failure")
+                    continue
+                standin.deliver(sender, recipients, b"".join(lines))
+                self._reply("250 OK: queued")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:  # RSET, NOOP, …
+                self._reply("250 OK")
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+# ── Harness ───────────────────────────────────────────────────────────────────
+
+class StandIn:
+    """Both stand-in servers, started on free local ports."""
+
+    def __init__(self, record: bool = False, cassette: str = CASSETTE_PATH, faults: Faults = None,
+                 host: str = "127.0.0.1"):
+        self.cassette = Cassette(cassette, record)
+        self.faults = faults or Faults()
+        self.sheets = Sheets(os.path.join(STANDIN_DIR, "sheets.json"))
+        self.outbox = os.path.join(STANDIN_DIR, "outbox")
+        self.delivered = 0
+        self._lock = threading.Lock()
+
+        self.http = ThreadingHTTPServer((host, 0), _Handler)
+        self.http.daemon_threads = True
+        self.smtp = _ThreadingTCPServer((host, 0), _SMTPHandler)
+        for server in (self.http, self.smtp):
+            server.standin = self
+        self.base_url = f"http://{host}:{self.http.server_port}"
+        self.smtp_port = self.smtp.server_address[1]
+        self._threads = []
+
+    def deliver(self, sender: str, recipients: list, message: bytes):
+        with self._lock:
+            self.delivered += 1
+            os.makedirs(self.outbox, exist_ok=True)
+            path = os.path.join(self.outbox, f"{datetime.now(timezone.utc):%Y%m%d_%H%M%S}_{self.delivered}.eml")
+        with open(path, "wb") as f:
+            f.write(message)
+        logger.info(f"standin smtp: {sender} → {', '.join(recipients)} saved to {path}")
+
+    @property
+    def env(self) -> dict:
+        """Environment that points every tool at the stand-ins (set before the tools are imported)."""
+        env = {
+            "NEWS_API_URL": f"{self.base_url}/v2/everything",
+            "ARXIV_API_URL": f"{self.base_url}/api/query",
+            "SHEETS_API_URL": f"{self.base_url}/",
+            "SMTP_HOST": self.smtp.server_address[0],
+            "SMTP_PORT": str(self.smtp_port),
+            "SMTP_SSL": "0",
+            # Replayed items must never reach the real corpus, its marks or the keyword history
+            "CORPUS_DIR": os.path.join(STANDIN_DIR, "corpus"),
+            "GMAIL_USER": "standin@example.com",
+            "GMAIL_APP_PASSWORD": "standin",
+            "EMAIL_RECIPIENTS": "team@example.com",
+            "GOOGLE_SHEET_ID": "standin",
+            "GOOGLE_SHEETS_CREDENTIALS": "standin",
+        }
+        if not self.cassette.record:
+            env["NEWS_API_KEY"] = "standin"  # recording forwards the real key upstream
+        return env
+
+    def start(self) -> "StandIn":
+        for server in (self.http, self.smtp):
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"standin: HTTP on {self.base_url}, SMTP on port {self.smtp_port}"
+                    f" ({'recording' if self.cassette.record else 'replaying'} {self.cassette.path})")
+        return self
+
+    def stop(self):
+        for server in (self.http, self.smtp):
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+    import subprocess
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    parser = argparse.ArgumentParser(description="Offline stand-ins for NewsAPI, ArXiv, Sheets and SMTP")
+    parser.add_argument("--record", action="store_true", help="Proxy NewsAPI/ArXiv upstream and save responses")
+    parser.add_argument("--cassette", default=CASSETTE_PATH)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests/messages that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status for injected failures")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="-- command to run against the stand-ins")
+    args = parser.parse_args()
+
+    faults = Faults(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, args.seed)
+    with StandIn(record=args.record, cassette=args.cassette, faults=faults) as standin:
+        command = args.command[1:] if args.command[:1] == ["--"] else args.command
+        if command:
+            sys.exit(subprocess.call(command, env={**os.environ, **standin.env}))
+        for key, value in standin.env.items():
+            print(f"export {key}={value}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
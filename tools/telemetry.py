@@ -0,0 +1,112 @@
+"""
+Module: telemetry.py
+Responsibility: Per-step resource profiling shared by the orchestrator and the tools.
+    profile_step(name) measures wall time, CPU time, peak RSS growth and bytes
+    written for the block it wraps; tools call count("http_requests") etc. to
+    add counters to whichever step is currently running. Outside a profiled
+    step, count() is a no-op, so tools behave the same when run standalone.
+    emit() and artifact() forward events, tagged with the running step, to the
+    run's JSONL event stream (see event_log.py).
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import event_log
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_current = ContextVar("telemetry_step", default=None)
+_step_name = ContextVar("telemetry_step_name", default=None)
+_lock = threading.Lock()
+
+# ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def _peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+def _thread_bytes_written():
+    """Bytes passed to write()-style syscalls by the calling thread (Linux only, else None)."""
+    try:
+        with open(f"/proc/self/task/{threading.get_native_id()}/io") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def count(metric: str, n: int = 1):
+    """Add `n` to a counter on the step currently being profiled (no-op outside a step)."""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    with _lock:
+        metrics[metric] = metrics.get(metric, 0) + n
+
+
+def emit(event: str, **fields):
+    """Stream an event tagged with the step currently being profiled."""
+    event_log.emit(event, step=_step_name.get(), **fields)
+
+
+def artifact(path: str):
+    """Record that the current step wrote a file."""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = None
+    emit("artifact_written", path=path, bytes=size)
+
+
+@contextmanager
+def profile_step(name: str):
+    """
+    Profile the wrapped block and yield the metrics dict it fills in.
+
+    CPU time and bytes written are measured for the calling thread; peak RSS is
+    process-wide, so when steps overlap the growth is attributed to whichever
+    step was running when the high-water mark moved.
+    """
+    metrics = {}
+    token = _current.set(metrics)
+    name_token = _step_name.set(name)
+    event_log.emit("step_started", step=name)
+    status = "failed"
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    rss_start = _peak_rss_bytes()
+    written_start = _thread_bytes_written()
+    try:
+        yield metrics
+        status = "ok"
+    finally:
+        _current.reset(token)
+        _step_name.reset(name_token)
+        for key, value in metrics.items():
+            if isinstance(value, float):
+                metrics[key] = round(value, 3)
+        written_end = _thread_bytes_written()
+        metrics.update({
+            "wall_time": round(time.perf_counter() - wall_start, 3),
+            "cpu_time": round(time.thread_time() - cpu_start, 3),
+            "peak_rss_delta_mb": round((_peak_rss_bytes() - rss_start) / 2**20, 2),
+            "bytes_written": (
+                written_end - written_start
+                if written_start is not None and written_end is not None else None
+            ),
+        })
+        event_log.emit("step_finished", step=name, status=status, **metrics)
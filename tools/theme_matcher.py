@@ -0,0 +1,112 @@
+"""
+Module: theme_matcher.py
+Responsibility: Match a theme taxonomy ({theme: [keyword, ...]}) against documents.
+    The keywords are compiled once into an Aho-Corasick automaton over *words*
+    rather than characters: a document is split into words by one regex and
+    walked through the automaton once, so every keyword of every theme is
+    found in a single scan whatever the size of the taxonomy. Because matches
+    start and end on word boundaries, "rl" no longer hits "world" nor "ner"
+    "partner". A keyword's last word also matches its plural ("agent" →
+    "agents", "language model" → "language models"). Hyphens separate words,
+    so "text-to-image" also matches "text to image" and "gpt" matches "GPT-4".
+    Callers that already split a document into words (analyze_trends) pass
+    them to scan_tokens() so the text is not tokenized a second time.
+"""
+
+import re
+from collections import Counter, deque
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class ThemeMatcher:
+    """
+    Word-level Aho-Corasick automaton for a theme taxonomy.
+
+    scan(text) returns keyword hits per theme in one document (scan_tokens
+    takes its lowercase words instead); match(texts) returns the per-theme scores over a corpus plus each
+    document's theme assignment.
+    """
+
+    def __init__(self, taxonomy: dict):
+        # State 0 is the root; goto[s] maps a word to the next state, out[s]
+        # lists (theme, length in words) of every keyword ending in state s.
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for theme, keywords in taxonomy.items():
+            for keyword in keywords:
+                words = TOKEN_RE.findall(keyword.lower())
+                if not words:
+                    continue
+                self._add(words, theme)
+                plural = words[-1] + "s"
+                if not words[-1].endswith("s"):
+                    self._add(words[:-1] + [plural], theme)
+        self._build_failure_links()
+        self._vocab = frozenset(word for goto in self._goto for word in goto)
+
+    def _add(self, words: list, theme: str):
+        state = 0
+        for word in words:
+            nxt = self._goto[state].get(word)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][word] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if theme not in self._out[state]:
+            self._out[state].append(theme)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + [t for t in self._out[self._fail[nxt]]
+                                                   if t not in self._out[nxt]]
+
+    def scan(self, text: str) -> Counter:
+        """Keyword hits per theme in one document (case-insensitive)."""
+        return self.scan_tokens(TOKEN_RE.findall(text.lower()))
+
+    def scan_tokens(self, words) -> Counter:
+        """
+        Keyword hits per theme in one document given as its lowercase words;
+        any other token (e.g. punctuation) ends the keyword in progress.
+        """
+        goto, fail, out, vocab = self._goto, self._fail, self._out, self._vocab
+        hits = Counter()
+        state = 0
+        for word in words:
+            if word not in vocab:
+                state = 0  # the common case: a word in no keyword sends the walk back to the root
+                continue
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if out[state]:
+                hits.update(out[state])
+        return hits
+
+    def match(self, texts) -> tuple:
+        """
+        (scores, assignments) over an iterable of documents: scores is a
+        Counter of keyword hits per theme, assignments holds, per document,
+        its themes ordered by hits (empty when nothing matched).
+        """
+        scores = Counter()
+        assignments = []
+        for text in texts:
+            hits = self.scan(text)
+            scores.update(hits)
+            assignments.append([theme for theme, _ in hits.most_common()])
+        return scores, assignments
@@ -12,8 +12,6 @@ import os
 from datetime import datetime, timezone
 
 from dotenv import load_dotenv
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 
 load_dotenv()
 
@@ -23,6 +21,8 @@ SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 SPREADSHEET_ID = os.environ.get("GOOGLE_SHEET_ID", "")
 CREDENTIALS_FILE = os.environ.get("GOOGLE_SHEETS_CREDENTIALS", "credentials.json")
 SHEET_NAME = "Run Log"
+SHEET_URL = f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}"
+SHEETS_API_URL = os.environ.get("SHEETS_API_URL", "")  # e.g. tools/standin.py; empty → Google
 
 COLUMN_HEADERS = [
     "Run Date", "Articles", "Papers", "Top Keywords",
@@ -31,6 +31,15 @@ COLUMN_HEADERS = [
 
 
 def _get_service():
+    from google.oauth2.service_account import Credentials
+    from googleapiclient.discovery import build
+
+    if SHEETS_API_URL:
+        from google.auth.credentials import AnonymousCredentials
+
+        return build("sheets", "v4", credentials=AnonymousCredentials(), static_discovery=True,
+                     client_options={"api_endpoint": SHEETS_API_URL})
+
     creds = Credentials.from_service_account_file(CREDENTIALS_FILE, scopes=SCOPES)
     return build("sheets", "v4", credentials=creds, cache_discovery=False)
 
@@ -98,12 +107,11 @@ def update_sheets(
             body={"values": [row]},
         ).execute()
 
-        sheet_url = f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}"
-        logger.info(f"update_sheets: row appended to {sheet_url}")
+        logger.info(f"update_sheets: row appended to {SHEET_URL}")
 
         return {
             "updated": True,
-            "sheet_url": sheet_url,
+            "sheet_url": SHEET_URL,
             "rows_added": 1,
         }
 